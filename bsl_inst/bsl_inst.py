@@ -1,7 +1,11 @@
 from .bsl_lib.Instruments import _PM100D
+from .bsl_lib.Instruments import _PM100D_group
 from .bsl_lib.Instruments import _HR4000CG
 from .bsl_lib.Instruments import _M69920
 from .bsl_lib.Instruments import _RS_7_1
+from .bsl_lib._bsl_log import bsl_log
+from .bsl_lib._bsl_stats import bsl_stats
+from .bsl_lib import _bsl_inst_discovery
 
 from loguru import logger
 import sys
@@ -10,26 +14,53 @@ import sys
 __is_logger_ready = False
 
 @staticmethod
-def init_logger(LOG_LEVEL:str="DEBUG"):
+def init_logger(LOG_LEVEL:str="DEBUG", enqueue:bool=False):
+    """
+    - Initialize the shared logger.
+
+    Parameters
+    ----------
+    LOG_LEVEL : `str`
+        (default to "DEBUG")
+        Minimum level of logged messages, transport trace messages are
+        not even formatted unless this is "TRACE".
+    enqueue : `bool`
+        (default to False)
+        Hand messages to a background writer through a queue, so that
+        logging never blocks instrument I/O.
+    """
     global __is_logger_ready
     format_str = "<cyan>{time:MM-DD at HH:mm:ss}</cyan> | <level>{level:7}</level> | {file:15}:{line:4} | <level>{message}</level>"
     logger.remove()
-    logger.add(sys.stdout, colorize=True, format=format_str, level=LOG_LEVEL, diagnose=False)
+    logger.add(sys.stdout, colorize=True, format=format_str, level=LOG_LEVEL, diagnose=False, enqueue=enqueue)
+    bsl_log.update_level(LOG_LEVEL)
     logger.success(f"Logger initlized with LOG_LEVEL = \"{LOG_LEVEL}\".")
     __is_logger_ready = True
     return None
 
 @staticmethod
-def PM100D(device_sn:str="") -> _PM100D.PM100D:
+def discover_all(models:list[str]=None) -> dict:
+    if not __is_logger_ready:
+        init_logger()
+    return _bsl_inst_discovery.discover_all(models)
+
+@staticmethod
+def PM100D(device_sn:str="", *, handles:dict=None) -> _PM100D.PM100D:
+    if not __is_logger_ready:
+        init_logger()
+    return _PM100D.PM100D(device_sn, handles=handles)
+
+@staticmethod
+def PM100D_group(meters:list) -> _PM100D_group.PM100D_group:
     if not __is_logger_ready:
         init_logger()
-    return _PM100D.PM100D(device_sn)
+    return _PM100D_group.PM100D_group(meters)
 
 @staticmethod
-def M69920(device_sn:str="") -> _M69920.M69920:
+def M69920(device_sn:str="", *, handles:dict=None, config:dict=None) -> _M69920.M69920:
     if not __is_logger_ready:
         init_logger()
-    return _M69920.M69920(device_sn)
+    return _M69920.M69920(device_sn, handles=handles, config=config)
 
 @staticmethod
 def HR4000CG(device_sn:str="") -> _HR4000CG.HR4000CG:
@@ -38,7 +69,7 @@ def HR4000CG(device_sn:str="") -> _HR4000CG.HR4000CG:
     return _HR4000CG.HR4000CG(device_sn)
 
 @staticmethod
-def RS_7_1(device_sn:str="") -> _RS_7_1.RS_7_1:
+def RS_7_1(device_sn:str="", *, handles:dict=None) -> _RS_7_1.RS_7_1:
     if not __is_logger_ready:
         init_logger()
-    return _RS_7_1.RS_7_1(device_sn)
\ No newline at end of file
+    return _RS_7_1.RS_7_1(device_sn, handles=handles)
\ No newline at end of file
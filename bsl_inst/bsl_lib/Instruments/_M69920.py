@@ -1,9 +1,20 @@
 import enum
 from loguru import logger
+import re
 import time
+import typing
+import math
+import threading
+from concurrent.futures import Future
+import numpy as np
+from numpy.typing import NDArray
 from ..Interface._bsl_serial import bsl_serial
 from .._bsl_inst_info import bsl_inst_info_list as inst
 from .._bsl_type import bsl_type
+from .._bsl_inst_discovery import select_handle
+from .._bsl_inst_cache import discovery_cache
+from .._bsl_retry import bsl_retry_policy
+from .._bsl_ring_buffer import bsl_ring_buffer
 
 logger_opt = logger.opt(ansi=True)
 
@@ -13,23 +24,120 @@ class M69920:
         CURRENT_MODE = 1
         POWER_MODE = 0
 
+    class STATUS(typing.NamedTuple):
+        """Immutable record of the power supply telemetry and settings."""
+        timestamp: float
+        current: float
+        voltage: float
+        power: int
+        lamp_hours: int
+        preset_current: float
+        preset_power: int
+        current_limit: float
+        power_limit: int
 
-    def __init__(self, device_sn="", *, mode=0, lim_current=0, lim_power=0) -> None:
+    # Status queries in the field order of `STATUS` after `timestamp`, with reply format and parser.
+    _STATUS_QUERIES = (
+        ('AMPS?', r"\d+\.\d", float),
+        ('VOLTS?', r"\d+\.\d", float),
+        ('WATTS?', r"\d+", int),
+        ('LAMP HRS?', r"\d+", int),
+        ('A-PRESET?', r"\d+\.\d", float),
+        ('P-PRESET?', r"\d+", int),
+        ('A-LIM?', r"\d+\.\d", float),
+        ('P-LIM?', r"\d+", int),
+    )
+    _STATUS_QUERY_FORMATS = {cmd: (pattern, parse) for (cmd, pattern, parse) in _STATUS_QUERIES}
+
+    # Bounds of the measured minimum gap between two commands, the legacy fixed gap being the upper one.
+    COMMAND_GAP_MIN_S = 0.002
+    COMMAND_GAP_MAX_S = 0.2
+    # Consecutive well-formed polls required to accept a gap, and safety factor applied to it.
+    COMMAND_GAP_TRIALS = 2
+    COMMAND_GAP_MARGIN = 1.5
+    # Deadline of a single reply.
+    REPLY_TIMEOUT_S = 0.3
+    # Bits of the "ESRXX" reply of a set command marking it as rejected: command and execution errors.
+    _ESR_REJECTED = 0b0011_0000
+
+    class RAMP:
+        """
+        - Handle of a running `ramp`, with progress and cancellation.
+        `result()` returns the final verified preset, or raises the
+        error that stopped the ramp.
+        """
+        def __init__(self, target:float, n_steps:int) -> None:
+            self.target = target
+            self.n_steps = n_steps
+            self.steps_done = 0
+            self.value = None
+            self.future = Future()
+            self._cancel = threading.Event()
+            pass
+
+        @property
+        def progress(self) -> float:
+            """Fraction of the steps written, 1.0 once done."""
+            return 1.0 if self.n_steps == 0 else self.steps_done / self.n_steps
+
+        def cancel(self) -> None:
+            """Stop after the step in progress, the preset stays at the last written value."""
+            self._cancel.set()
+            pass
+
+        def cancelled(self) -> bool:
+            return self._cancel.is_set()
+
+        def done(self) -> bool:
+            return self.future.done()
+
+        def result(self, timeout:float=None) -> float:
+            return self.future.result(timeout)
+
+    # Profiles of `ramp`: normalized preset against normalized time, and peak over average rate.
+    RAMP_PROFILES = {
+        "linear": (lambda x: x, 1.0),
+        "s_curve": (lambda x: x * x * (3 - 2 * x), 1.5),
+    }
+
+    class CONFIG(typing.NamedTuple):
+        """Desired power supply configuration for `apply_config`, None fields are left as they are."""
+        mode: int = None
+        current_limit: float = None
+        power_limit: int = None
+        preset_current: float = None
+        preset_power: int = None
+        lamp_on: bool = None
+
+    # Telemetry fields of `STATUS` recorded by the monitor, in column order of `history`.
+    MONITOR_FIELDS = ("current", "voltage", "power", "lamp_hours")
+
+    # Retry policy of `_query`, unanswered or garbled queries are sent again.
+    RETRY_POLICY = bsl_retry_policy(max_attempts=3, base_delay_s=0.005, max_delay_s=0.05, deadline_s=2.0)
+
+    def __init__(self, device_sn="", *, mode=0, lim_current=None, lim_power=None, handles:dict=None, config:CONFIG=None) -> None:
         self.target_device_sn = device_sn
+        self._handle = select_handle(handles, inst.M69920, device_sn)
         self.serial_port = None
         self.device_id = ""
+        self.command_gap_s = self.COMMAND_GAP_MAX_S
+        self._last_command_time = 0.0
+        # Serializes port transactions between foreground commands and the telemetry monitor.
+        self._port_lock = threading.RLock()
+        self._monitor_thread = None
+        self._monitor_stop = threading.Event()
+        self.monitor_buffer = None
+        self._latest_status = None
+        self._ramp = None
         
         logger.info(f"Initiating bsl_instrument - M69920({device_sn})...")
         if self._serial_connect():
             logger.info("M69920 Monochromator lamp's power supply connected!")
-            self._update_lamp_op_status()
-            self._update_lamp_power_status()
-            self.lamp_OFF()
-            self.set_lamp_mode(mode)
-            self.set_lamp_current_limit(lim_current)
-            self.set_lamp_power_limit(lim_power)
-            self.set_lamp_current(0.0)
-            self.set_lamp_power(0)
+            self._restore_command_gap()
+            if config is None:
+                # Legacy initialization: lamp OFF with the preset of `mode` at 0.
+                config = self.CONFIG(mode=mode, current_limit=lim_current, power_limit=lim_power, preset_current=0.0, preset_power=0, lamp_on=False)
+            self.apply_config(config)
             logger.success("READY - M69920 Monochromator lamp's power supply.")
         else:
             logger.error(f"FAILED to connect to M69920 Monochromator lamp's power supply!\n\n\n")
@@ -42,80 +150,181 @@ class M69920:
 
     def _serial_connect(self) -> bool:
         try:
-            self.serial = bsl_serial(inst.M69920, self.target_device_sn)
+            self.serial = bsl_serial(inst.M69920, self.target_device_sn, handle=self._handle)
         except Exception as e:
             logger.error(f"{type(e)}")
             
         if self.serial.serial_port is None:
             return False
+        self.serial.retry_policy = self.RETRY_POLICY
         return self.serial.serial_port.is_open
 
     def lamp_ON(self) -> None:
-        self.serial.writeline('START')
+        self._command('START')
         self._update_lamp_op_status()
         if self.is_lamp_ON:
             logger.success("    M69920 lamp turned ON.")
         else:
             logger.error("    Failed to turn ON - M69920 Monochromator_Lamp's Power Supply")
             raise bsl_type.DeviceOperationError
-        time.sleep(0.2)
         pass
     
     def lamp_OFF(self) -> None:
-        self.serial.writeline('STOP')
+        self._command('STOP')
         self._update_lamp_op_status()
         if not self.is_lamp_ON:
             logger.success("    M69920 lamp turned OFF.")
         else:
             logger.error("    Failed to turn OFF - M69920 Monochromator_Lamp's Power Supply")
             raise bsl_type.DeviceOperationError
-        time.sleep(0.2)
         pass
 
     def set_lamp_mode(self, mode:SUPPLY_MODE) -> None:
+        mode = self.SUPPLY_MODE(mode)
         if self.is_lamp_ON:
             logger.error("    Lamp need to be turned OFF before changing PWR mode!")
             self.lamp_OFF()
             
         if mode == self.SUPPLY_MODE.CURRENT_MODE:
             # Set MODE=1 for current mode operation
-            self.serial.writeline('MODE=1')
+            self._command('MODE=1')
         else:
             # Set MODE=0 for power mode operation
-            self.serial.writeline('MODE=0')
+            self._command('MODE=0')
         
         self._update_lamp_op_status()
         if self.mode != mode:
             logger.error(f"    FAILED to change M69920 Operation mode!")
             raise bsl_type.DeviceInconsistentError
-        time.sleep(0.2)
         pass
 
     def lock_front_panel(self) -> None:
         # Set COMM=1 to lock front panel access
-        self.serial.writeline('COMM=1')
+        self._command('COMM=1')
         
         self._update_lamp_op_status()
         if self.frontpanel_lock != True:
             logger.error(f"    FAILED to lock M69920 front panel!")
             raise bsl_type.DeviceInconsistentError
-        time.sleep(0.2)
         pass
 
     def unlock_front_panel(self) -> None:
         # Set COMM=0 to unlock front panel access
-        self.serial.writeline('COMM=0')
+        self._command('COMM=0')
         
         self._update_lamp_op_status()
         if self.frontpanel_lock == True:
             logger.error(f"    FAILED to unlock M69920 front panel!")
             raise bsl_type.DeviceInconsistentError
-        time.sleep(0.2)
         pass
 
-    def set_lamp_current(self, current:float) -> None:
+    def refresh_status(self) -> STATUS:
+        """
+        - Re-read the op status byte and all power parameters.
+        """
+        self._update_lamp_op_status()
+        return self._update_lamp_power_status()
+
+    def apply_config(self, desired:CONFIG) -> list[str]:
+        """
+        - Bring the power supply to the `desired` configuration, reading
+        its state once and writing only the fields that differ, so an
+        already running and correctly configured supply is left untouched.
+
+        - Limits and presets are written in an order keeping every preset
+        below its limit. Changing the mode requires turning the lamp OFF,
+        it is turned back ON afterwards if it was ON and `lamp_on` is None.
+        Only the preset of the resulting mode is applied.
+
+        Parameters
+        ----------
+        desired : `M69920.CONFIG` or `dict`
+            Desired configuration, None fields are left as they are.
+
+        Returns
+        --------
+        changed : `list[str]`
+            Names of the `CONFIG` fields written to the power supply.
+        """
+        if isinstance(desired, dict):
+            desired = self.CONFIG(**desired)
+        self.refresh_status()
+        was_lamp_ON = self.is_lamp_ON
+        changed = list()
+
+        # Refuse a preset at or above its resulting limit before anything is written,
+        # the supply would reject it only after the other fields were changed.
+        mode = self.mode if desired.mode is None else self.SUPPLY_MODE(desired.mode)
+        (preset_field, limit_field) = ("preset_current", "current_limit") if mode == self.SUPPLY_MODE.CURRENT_MODE else ("preset_power", "power_limit")
+        (preset, limit) = (getattr(desired, preset_field), getattr(desired, limit_field))
+        limit = getattr(self, limit_field) if limit is None else limit
+        if preset is not None and preset >= limit:
+            logger.error(f"    FAILED to apply M69920 configuration, {preset_field} {preset} is not below {limit_field} {limit}!")
+            raise bsl_type.DeviceInconsistentError
+
+        if desired.lamp_on is False and self.is_lamp_ON:
+            self.lamp_OFF()
+            changed.append("lamp_on")
+        if desired.mode is not None and self.SUPPLY_MODE(desired.mode) != self.mode:
+            self.set_lamp_mode(desired.mode)
+            changed.append("mode")
+
+        for (mode, preset_field, limit_field, resolution, set_preset, set_limit) in (
+            (self.SUPPLY_MODE.CURRENT_MODE, "preset_current", "current_limit", 1, self.set_lamp_current, self.set_lamp_current_limit),
+            (self.SUPPLY_MODE.POWER_MODE, "preset_power", "power_limit", 0, self.set_lamp_power, self.set_lamp_power_limit),
+        ):
+            preset = getattr(desired, preset_field)
+            limit = getattr(desired, limit_field)
+            if preset is not None and mode != self.mode:
+                logger.debug(f"    M69920 {preset_field} skipped, power supply is in {self.mode.name}.")
+                preset = None
+            preset_differs = preset is not None and round(preset, resolution) != getattr(self, preset_field)
+            limit_differs = limit is not None and round(limit, resolution) != getattr(self, limit_field)
+            # Lower the preset before the limit, raise the limit before the preset.
+            if preset_differs and preset < getattr(self, limit_field):
+                set_preset(preset)
+                changed.append(preset_field)
+                preset_differs = False
+            if limit_differs:
+                set_limit(limit)
+                changed.append(limit_field)
+            if preset_differs:
+                set_preset(preset)
+                changed.append(preset_field)
+
+        if not self.is_lamp_ON and (desired.lamp_on or (desired.lamp_on is None and was_lamp_ON)):
+            self.lamp_ON()
+            changed.append("lamp_on")
+        if len(changed) == 0:
+            logger.info("    M69920 already configured, nothing written.")
+        else:
+            logger.info(f"    M69920 configuration applied, {changed} written.")
+        return changed
+
+    def _verify_setting(self, refresh:bool) -> None:
+        # Full refresh on request, otherwise the status byte only while the output follows the new setting.
+        if refresh:
+            self.refresh_status()
+        elif self.is_lamp_ON:
+            self._update_lamp_op_status()
+        pass
+
+    def set_lamp_current(self, current:float, refresh:bool=False) -> None:
+        """
+        - Set the lamp current preset (`A`) of `CURRENT_MODE`, verified by
+        the event status reply of the `A-PRESET=` command, which flags a
+        rejected preset, e.g. one at or above its limit.
+
+        Parameters
+        ----------
+        current : `float`
+            Lamp current preset, below `current_limit`.
+        refresh : `bool`
+            (default to False)
+            Re-read the op status and all power parameters afterwards.
+        """
         # Check if current power supply mode is current mode
-        if self.mode == self.SUPPLY_MODE.CURRENT_MODE:
+        if self.mode != self.SUPPLY_MODE.CURRENT_MODE:
             logger.error(f"    FAILED to set M69920 lamp current, power supply is in POWER_MODE!")
             raise bsl_type.DeviceInconsistentError
         # Check if the desired current is smaller than current limits
@@ -124,21 +333,30 @@ class M69920:
             raise bsl_type.DeviceInconsistentError
             
         msg = f'A-PRESET={current:.1f}'
-        self.serial.writeline(msg)
-        time.sleep(0.2)
-        self._update_lamp_op_status()
-        self._update_lamp_power_status()
-        if self.preset_current != current:
-            logger.error(f"    FAILED to set M69920 lamp current to {current:.1f} with read back current {self.preset_current:.1f}!")
-            raise bsl_type.DeviceInconsistentError
+        self._command(msg)
+        self.preset_current = round(current, 1)
+        self._verify_setting(refresh)
         logger.success(f"    M69920 lamp current set to {self.preset_current:.1f}")    
-        time.sleep(0.2)   
         pass
     
-    def set_lamp_power(self, power:int) -> None:
-        # Check if current power supply mode is current mode
-        if self.mode == self.SUPPLY_MODE.POWER_MODE:
-            logger.error(f"    FAILED to set M69920 lamp current, power supply is in CURRENT_MODE!")
+    def set_lamp_power(self, power:int, refresh:bool=False) -> None:
+        """
+        - Set the lamp power preset (`W`) of `POWER_MODE`, verified by
+        the event status reply of the `P-PRESET=` command, which flags a
+        rejected preset, e.g. one at or above its limit.
+
+        Parameters
+        ----------
+        power : `int`
+            Lamp power preset, below `power_limit`.
+        refresh : `bool`
+            (default to False)
+            Re-read the op status and all power parameters afterwards.
+        """
+        power = int(power)
+        # Check if current power supply mode is power mode
+        if self.mode != self.SUPPLY_MODE.POWER_MODE:
+            logger.error(f"    FAILED to set M69920 lamp power, power supply is in CURRENT_MODE!")
             raise bsl_type.DeviceInconsistentError
         # Check if the desired current is smaller than current limits
         if power >= self.power_limit:
@@ -146,62 +364,189 @@ class M69920:
             raise bsl_type.DeviceInconsistentError
             
         msg = f'P-PRESET={power:04d}'
-        self.serial.writeline(msg)
-        time.sleep(0.2)
-        self._update_lamp_op_status()
-        self._update_lamp_power_status()
-        if self.preset_power != power:
-            logger.error(f"    FAILED to set M69920 lamp power to {power:04d} with read back power {self.preset_power:04d}!")
+        self._command(msg)
+        self.preset_power = power
+        self._verify_setting(refresh)
         logger.success(f"    M69920 lamp power set to {self.preset_power:04d}")       
-        time.sleep(0.2)
         pass
     
-    def set_lamp_current_limit(self, lim_I) -> None:
+    def set_lamp_current_limit(self, lim_I, refresh:bool=False) -> None:
+        """
+        - Set the lamp current limit (`A`), verified by the event
+        status reply of the `A-LIM=` command.
+
+        Parameters
+        ----------
+        lim_I : `float`
+            Lamp current limit, above `preset_current`.
+        refresh : `bool`
+            (default to False)
+            Re-read the op status and all power parameters afterwards.
+        """
         # Check if the desired current is smaller than current limits
         if lim_I <= self.preset_current:
             logger.error(f"    FAILED to set M69920 lamp current_limit to {lim_I:.1f} since current limit is smaller than preset_current {self.preset_current:.1f}!")
             raise bsl_type.DeviceInconsistentError
             
         msg = f'A-LIM={lim_I:.1f}'
-        self.serial.writeline(msg)
-        time.sleep(0.2)
-        self._update_lamp_op_status()
-        self._update_lamp_power_status()
-        if self.current_limit != lim_I:
-            logger.error(f"    FAILED to set M69920 lamp current_limit to {lim_I:.1f} with read back current {self.current_limit:.1f}!")
-            raise bsl_type.DeviceInconsistentError
+        self._command(msg)
+        self.current_limit = round(lim_I, 1)
+        self._verify_setting(refresh)
         logger.success(f"    M69920 lamp current_limit set to {self.current_limit:.1f}")       
-        time.sleep(0.2)
         pass
 
-    def set_lamp_power_limit(self, lim_P) -> None:
+    def set_lamp_power_limit(self, lim_P, refresh:bool=False) -> None:
+        """
+        - Set the lamp power limit (`W`), verified by the event
+        status reply of the `P-LIM=` command.
+
+        Parameters
+        ----------
+        lim_P : `int`
+            Lamp power limit, above `preset_power`.
+        refresh : `bool`
+            (default to False)
+            Re-read the op status and all power parameters afterwards.
+        """
+        lim_P = int(lim_P)
         # Check if the desired current is smaller than current limits
         if lim_P <= self.preset_power:
             logger.error(f"    FAILED to set M69920 lamp power_limit to {lim_P:04d} since it's smaller than preset power {self.preset_power:04d}!")
             raise bsl_type.DeviceInconsistentError
             
         msg = f'P-LIM={lim_P:04d}'
-        self.serial.writeline(msg)
-        time.sleep(0.2)
-        self._update_lamp_op_status()
-        self._update_lamp_power_status()
-        if self.power_limit != lim_P:
-            logger.error(f"    FAILED to set M69920 lamp power_limit to {lim_P:04d} with read back power {self.power_limit:04d}!")
+        self._command(msg)
+        self.power_limit = lim_P
+        self._verify_setting(refresh)
         logger.success(f"    M69920 lamp power_limit set to {self.power_limit:04d}")       
-        time.sleep(0.2)
         pass
 
-    def _update_lamp_op_status(self) -> None:
-        time.sleep(0.2)
-        # Request status register from the power supply.
-        self.serial.flush_read_buffer()
-        self.serial.writeline('STB?')
-        resp = self.serial.serial_port.readline()
+    def _restore_command_gap(self) -> float:
+        # Reuse the gap measured on a previous connection if a status poll still succeeds with it.
+        gap = None
+        if self.serial.use_cache:
+            gap = discovery_cache.lookup_setting(inst.M69920, self.serial.device_id, "command_gap_s")
+        if gap is not None:
+            self.command_gap_s = max(float(gap), self.COMMAND_GAP_MIN_S * self.COMMAND_GAP_MARGIN)
+            try:
+                self._poll_status(quiet=True)
+                logger.info(f"    M69920 command gap of {self.command_gap_s*1000:.1f}ms restored from the discovery cache.")
+                return self.command_gap_s
+            except (ValueError, bsl_type.DeviceInconsistentError):
+                time.sleep(self.command_gap_s * len(self._STATUS_QUERIES))
+                self.serial.flush_read_buffer()
+        return self.measure_command_gap()
+
+    def measure_command_gap(self) -> float:
+        """
+        - Measure the minimum gap between two commands the power supply
+        keeps up with. Full status polls are issued with a growing gap,
+        starting at `COMMAND_GAP_MIN_S`, until `COMMAND_GAP_TRIALS` polls
+        in a row return well-formed replies.
+
+        - The result is kept in the discovery cache and reused by the
+        next connection instead of being measured again.
+
+        Returns
+        --------
+        command_gap_s : `float`
+            Enforced gap in seconds, including `COMMAND_GAP_MARGIN`.
+        """
+        gap = self.COMMAND_GAP_MIN_S
+        while True:
+            self.command_gap_s = gap
+            try:
+                for _ in range(self.COMMAND_GAP_TRIALS):
+                    self._poll_status(quiet=True)
+                break
+            except (ValueError, bsl_type.DeviceInconsistentError):
+                # Let late replies of the failed poll arrive before retrying with a longer gap.
+                time.sleep(gap * len(self._STATUS_QUERIES))
+                self.serial.flush_read_buffer()
+            if gap >= self.COMMAND_GAP_MAX_S:
+                logger.warning(f"    M69920 did not keep up with a {gap*1000:.0f}ms command gap, keeping it.")
+                break
+            gap = min(self.COMMAND_GAP_MAX_S, 2 * gap)
+        # The margin only means something on top of a non-zero gap.
+        self.command_gap_s = max(gap, self.COMMAND_GAP_MIN_S) * self.COMMAND_GAP_MARGIN
+        logger.info(f"    M69920 minimum command gap measured as {self.command_gap_s*1000:.1f}ms.")
+        if self.serial.use_cache:
+            discovery_cache.store_setting(inst.M69920, self.serial.device_id, "command_gap_s", self.command_gap_s)
+        return self.command_gap_s
+
+    def _pace(self) -> None:
+        # Wait until `command_gap_s` has passed since the previous command.
+        remaining = self._last_command_time + self.command_gap_s - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+        self._last_command_time = time.monotonic()
+        pass
+
+    def _write(self, cmd:str, flush:bool=False) -> None:
+        # Rate-limited write. The flush comes after the pacing, so replies
+        # still in flight from the previous command are dropped as well.
+        with self._port_lock:
+            self._pace()
+            if flush:
+                self.serial.flush_read_buffer()
+            # Not retried on its own, `_query` retries the whole query.
+            self.serial._write_once(cmd + '\r\n')
+        pass
+
+    def _command(self, cmd:str) -> int:
+        # Set command, the power supply replies with its event status register "ESRXX".
+        # Returns the register, raises if it marks the command as rejected.
+        with self._port_lock:
+            self._write(cmd, flush=True)
+            resp = self.serial.readline(self.REPLY_TIMEOUT_S)
+        h_status = self._parse_reply(cmd, resp, r"ESR[0-9A-Fa-f]{2}", lambda resp: int(resp[3:5], 16))
+        if (h_status & self._ESR_REJECTED) != 0:
+            logger.error(f"    M69920 rejected {cmd} with event status {resp}!")
+            raise bsl_type.DeviceOperationError
+        return h_status
+
+    def _query(self, cmd:str, pattern:str, parse):
+        # Rate-limited query of a single reply, sent again according to `retry_policy`
+        # while the reply does not match `pattern`, then parsed.
+        resp = self.serial.retry_policy.call(self._query_once, cmd, description=lambda: f"M69920 query {repr(cmd)}", retry_if=lambda resp: re.fullmatch(pattern, resp) is None)
+        return self._parse_reply(cmd, resp, pattern, parse)
+
+    def _query_once(self, cmd:str) -> str:
+        with self._port_lock:
+            self._write(cmd, flush=True)
+            return self.serial.readline(self.REPLY_TIMEOUT_S)
+
+    def _parse_reply(self, cmd:str, resp:str, pattern:str, parse, quiet:bool=False):
+        if re.fullmatch(pattern, resp) is None:
+            if not quiet:
+                logger.error(f"    M69920 replied {repr(resp)} to {cmd}!")
+            raise bsl_type.DeviceInconsistentError
+        return parse(resp)
 
-        # Make sure reply from the power supply satisfy format.
-        assert len(resp == 5)
-        # Parse the status bit from incomming msg
-        h_status = int(resp[3:5],16)
+    def poll_status(self) -> STATUS:
+        """
+        - Issue the 8 telemetry and setting queries back to back, paced by
+        the measured `command_gap_s` only, then parse the replies in one
+        pass. A full refresh costs about the wire time.
+
+        Returns
+        --------
+        status : `M69920.STATUS`
+            Immutable record of the readings with a `time.monotonic()` timestamp.
+        """
+        return self._poll_status()
+
+    def _poll_status(self, quiet:bool=False) -> STATUS:
+        with self._port_lock:
+            for (index, (cmd, _, _)) in enumerate(self._STATUS_QUERIES):
+                self._write(cmd, flush=index == 0)
+            resps = [self.serial.readline(self.REPLY_TIMEOUT_S) for _ in self._STATUS_QUERIES]
+        timestamp = time.monotonic()
+        return self.STATUS(timestamp, *[self._parse_reply(cmd, resp, pattern, parse, quiet) for ((cmd, pattern, parse), resp) in zip(self._STATUS_QUERIES, resps)])
+
+    def _update_lamp_op_status(self) -> None:
+        # Request status register from the power supply, reply format "STBXX".
+        h_status = self._query('STB?', r"STB[0-9A-Fa-f]{2}", lambda resp: int(resp[3:5], 16))
 
         # Check bit-7 for lamp status
         if (h_status &0b1000_0000) != 0:
@@ -219,9 +564,9 @@ class M69920:
             self._read_error_register()
         # Check bit-2 for front panel lock status
         if (h_status &0b0000_0100) != 0:
-            self.mode = self.frontpanel_lock = True
+            self.frontpanel_lock = True
         else:
-            self.mode = self.frontpanel_lock = False
+            self.frontpanel_lock = False
             logger.error("Monochromator Power Supply front panel is not locked, take caution!")
         # Check bit-1 for power_supply limit status
         if (h_status &0b0000_0010) != 0:
@@ -232,29 +577,22 @@ class M69920:
         self._read_error_register()
         pass
     
-    def _update_lamp_power_status(self) -> None:
-        self.cur_current = self._read_current_current()
-        self.cur_voltage = self._read_current_voltage()
-        self.cur_power = self._read_current_power()
-        self.cur_lamp_hours = self._read_current_lamp_hours()
-        self.preset_current = self._read_set_current()
-        self.preset_power = self._read_set_power()
-        self.current_limit = self._read_set_current_limit()
-        self.power_limit = self._read_set_power_limit()
+    def _update_lamp_power_status(self) -> STATUS:
+        status = self.poll_status()
+        self.cur_current = status.current
+        self.cur_voltage = status.voltage
+        self.cur_power = status.power
+        self.cur_lamp_hours = status.lamp_hours
+        self.preset_current = status.preset_current
+        self.preset_power = status.preset_power
+        self.current_limit = status.current_limit
+        self.power_limit = status.power_limit
         logger.trace("  Lamp power related parameters updated from the power supply M69920.")
-        pass
+        return status
 
     def _read_error_register(self) -> None:
-        time.sleep(0.2)
-        # Request status register from the power supply.
-        self.serial.flush_read_buffer()
-        self.serial.writeline('ESR?')
-        resp = self.serial.serial_port.readline()
-
-        # Make sure reply from the power supply satisfy format "ESRXX".
-        assert len(resp == 5)
-        # Parse the status bit from incomming msg
-        h_status = int(resp[3:5],16)
+        # Request event status register from the power supply, reply format "ESRXX".
+        h_status = self._query('ESR?', r"ESR[0-9A-Fa-f]{2}", lambda resp: int(resp[3:5], 16))
 
         # Check bit-7 for power ON error
         if (h_status &0b1000_0000) != 0:
@@ -287,96 +625,242 @@ class M69920:
         pass
 
     def _read_current_current(self) -> float:
-        time.sleep(0.2)
-        # Request current reading from the power supply.
-        self.serial.flush_read_buffer()
-        self.serial.writeline('AMPS?')
-        resp = self.serial.serial_port.readline()
-        # Make sure reply from the power supply satisfy format "XX.X" Amps.
-        assert len(resp == 4)
-        return float(resp.decode('utf-8'))
+        # Reply format "XX.X" Amps.
+        return self._query('AMPS?', *self._STATUS_QUERY_FORMATS['AMPS?'])
 
     def _read_current_voltage(self) -> float:
-        time.sleep(0.2)
-        # Request current reading from the power supply.
-        self.serial.flush_read_buffer()
-        self.serial.writeline('VOLTS?')
-        resp = self.serial.serial_port.readline()
-        # Make sure reply from the power supply satisfy format "XX.X" Volts.
-        assert len(resp == 4)
-        return float(resp.decode('utf-8'))
+        # Reply format "XX.X" Volts.
+        return self._query('VOLTS?', *self._STATUS_QUERY_FORMATS['VOLTS?'])
 
     def _read_current_power(self) -> int:
-        time.sleep(0.2)
-        # Request current reading from the power supply.
-        self.serial.flush_read_buffer()
-        self.serial.writeline('WATTS?')
-        resp = self.serial.serial_port.readline()
-        # Make sure reply from the power supply satisfy format "XXXX" Watts.
-        assert len(resp == 4)
-        return int(resp.decode('utf-8'))
+        # Reply format "XXXX" Watts.
+        return self._query('WATTS?', *self._STATUS_QUERY_FORMATS['WATTS?'])
 
     def _read_current_lamp_hours(self) -> int:
-        time.sleep(0.2)
-        # Request current reading from the power supply.
-        self.serial.flush_read_buffer()
-        self.serial.writeline('LAMP HRS?')
-        resp = self.serial.serial_port.readline()
-        # Make sure reply from the power supply satisfy format "XXXX" Hours.
-        assert len(resp == 4)
-        return int(resp.decode('utf-8'))
+        # Reply format "XXXX" Hours.
+        return self._query('LAMP HRS?', *self._STATUS_QUERY_FORMATS['LAMP HRS?'])
     
     def _read_set_current(self) -> float:
-        time.sleep(0.2)
-        # Request current reading from the power supply.
-        self.serial.flush_read_buffer()
-        self.serial.writeline('A-PRESET?')
-        resp = self.serial.serial_port.readline()
-        # Make sure reply from the power supply satisfy format "XX.X" Amps.
-        assert len(resp == 4)
-        return float(resp.decode('utf-8'))
+        # Reply format "XX.X" Amps.
+        return self._query('A-PRESET?', *self._STATUS_QUERY_FORMATS['A-PRESET?'])
 
     def _read_set_power(self) -> int:
-        time.sleep(0.2)
-        # Request current reading from the power supply.
-        self.serial.flush_read_buffer()
-        self.serial.writeline('P-PRESET?')
-        resp = self.serial.serial_port.readline()
-        # Make sure reply from the power supply satisfy format "XXXX" Watts.
-        assert len(resp == 4)
-        return int(resp.decode('utf-8'))
+        # Reply format "XXXX" Watts.
+        return self._query('P-PRESET?', *self._STATUS_QUERY_FORMATS['P-PRESET?'])
 
     def _read_set_current_limit(self) -> float:
-        time.sleep(0.2)
-        # Request current reading from the power supply.
-        self.serial.flush_read_buffer()
-        self.serial.writeline('A-LIM?')
-        resp = self.serial.serial_port.readline()
-        # Make sure reply from the power supply satisfy format "XX.X" Amps.
-        assert len(resp == 4)
-        return float(resp.decode('utf-8'))
+        # Reply format "XX.X" Amps.
+        return self._query('A-LIM?', *self._STATUS_QUERY_FORMATS['A-LIM?'])
 
     def _read_set_power_limit(self) -> int:
-        time.sleep(0.2)
-        # Request current reading from the power supply.
-        self.serial.flush_read_buffer()
-        self.serial.writeline('P-LIM?')
-        resp = self.serial.serial_port.readline()
-        # Make sure reply from the power supply satisfy format "XXXX" Watts.
-        assert len(resp == 4)
-        return int(resp.decode('utf-8'))
+        # Reply format "XXXX" Watts.
+        return self._query('P-LIM?', *self._STATUS_QUERY_FORMATS['P-LIM?'])
     
+    def start_monitor(self, rate_hz:float=1.0, capacity:int=36_000) -> bsl_ring_buffer:
+        """
+        - Poll the telemetry in a background thread at `rate_hz` into a
+        preallocated ring buffer with monotonic timestamps. The serial
+        port is shared with foreground commands through the port lock,
+        a poll only waits for the command in progress.
+
+        Parameters
+        ----------
+        rate_hz : `float`
+            (default to 1.0)
+            Polling rate, capped by the time a full poll takes.
+        capacity : `int`
+            (default to 36000)
+            Number of latest samples kept, 10 hours at 1 Hz.
+
+        Returns
+        --------
+        monitor_buffer : `bsl_ring_buffer`
+            Ring buffer of the `MONITOR_FIELDS` columns, see `history`.
+        """
+        if self._monitor_thread is not None:
+            logger.warning("    M69920 telemetry monitor already running.")
+            return self.monitor_buffer
+        self.monitor_buffer = bsl_ring_buffer(capacity, len(self.MONITOR_FIELDS))
+        self._monitor_stop.clear()
+        self._monitor_thread = threading.Thread(target=self._monitor_loop, args=(1.0 / rate_hz,), name=f"M69920_monitor_{self.device_id}", daemon=True)
+        self._monitor_thread.start()
+        logger.info(f"    M69920 telemetry monitor started at {rate_hz:g}Hz.")
+        return self.monitor_buffer
+
+    def stop_monitor(self) -> None:
+        """
+        - Stop the telemetry monitor, the ring buffer is kept.
+        """
+        if self._monitor_thread is None:
+            return None
+        self._monitor_stop.set()
+        self._monitor_thread.join()
+        self._monitor_thread = None
+        logger.info(f"    M69920 telemetry monitor stopped after {self.monitor_buffer.total_count} samples.")
+        pass
+
+    def _monitor_loop(self, period:float) -> None:
+        monitor_buffer = self.monitor_buffer
+        next_time = time.monotonic()
+        while not self._monitor_stop.is_set():
+            try:
+                status = self._poll_status(quiet=True)
+            except Exception as e:
+                logger.warning(f"    M69920 telemetry poll failed with {type(e)}.")
+            else:
+                self._latest_status = status
+                monitor_buffer.append(status.timestamp, [getattr(status, field) for field in self.MONITOR_FIELDS])
+            # Leave the port to waiting foreground commands for at least one command gap.
+            next_time = max(next_time + period, time.monotonic() + self.command_gap_s)
+            self._monitor_stop.wait(next_time - time.monotonic())
+        pass
+
+    def latest(self) -> STATUS:
+        """
+        - Latest telemetry polled by the monitor, None before the first
+        poll. Never touches the serial port.
+        """
+        return self._latest_status
+
+    def history(self, window:float=None) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        - Zero-copy views of the monitored telemetry, oldest first.
+        Views are overwritten by later samples, use `.copy()` to keep them.
+
+        Parameters
+        ----------
+        window : `float`
+            (default to all buffered samples)
+            Only samples within the last `window` seconds.
+
+        Returns
+        --------
+        (timestamps, values) : `tuple[numpy.ndarray, numpy.ndarray]`
+            `time.monotonic()` timestamps, and values with one column per
+            `MONITOR_FIELDS` entry: amps, volts, watts and lamp hours.
+        """
+        if self.monitor_buffer is None:
+            logger.error("    M69920 telemetry monitor was never started!")
+            raise bsl_type.DeviceOperationError
+        if window is None:
+            return self.monitor_buffer.view()
+        return self.monitor_buffer.window(window)
+
+    def ramp(self, target:float, rate:float, *, step:float=None, profile:str="linear", checkpoint_every:int=10) -> RAMP:
+        """
+        - Ramp the preset of the active supply mode (current in
+        `CURRENT_MODE`, power in `POWER_MODE`) to `target` in a
+        background thread, so the caller can go on with other instruments.
+
+        - Every step only reads the event status reply of its write, a
+        rejected step stops the ramp. The preset register and the status
+        byte are verified at every `checkpoint_every`-th step, on
+        cancellation and at the end. The target is checked
+        against `current_limit`/`power_limit` before starting.
+
+        Parameters
+        ----------
+        target : `float`
+            Final preset, `A` in `CURRENT_MODE` or `W` in `POWER_MODE`.
+        rate : `float`
+            Peak ramp rate in `A/s` or `W/s`.
+        step : `float`
+            (default to the register resolution, 0.1A or 1W)
+            Preset change per step, rounded to the register resolution.
+        profile : `str`
+            (default to "linear")
+            Shape of the ramp, see `RAMP_PROFILES`. "s_curve" eases in
+            and out, its peak rate is still `rate`.
+        checkpoint_every : `int`
+            (default to 10)
+            Number of steps between two verifications.
+
+        Returns
+        --------
+        ramp : `M69920.RAMP`
+            Handle with `progress`, `cancel()`, `done()` and `result()`.
+        """
+        if self._ramp is not None and not self._ramp.done():
+            logger.error("    M69920 ramp already running, cancel it first!")
+            raise bsl_type.DeviceOperationError
+        (shape, peak_ratio) = self.RAMP_PROFILES[profile]
+        if self.mode == self.SUPPLY_MODE.CURRENT_MODE:
+            (start, limit, resolution) = (self.preset_current, self.current_limit, 0.1)
+        else:
+            (start, limit, resolution) = (self.preset_power, self.power_limit, 1)
+        if target >= limit:
+            logger.error(f"    FAILED to ramp M69920 lamp to {target} since limit is set to {limit}!")
+            raise bsl_type.DeviceInconsistentError
+
+        step = resolution if step is None else max(resolution, step)
+        n_steps = math.ceil(abs(target - start) / step)
+        duration = peak_ratio * abs(target - start) / rate
+        self._ramp = ramp = self.RAMP(target, n_steps)
+        ramp.value = start
+        threading.Thread(target=self._ramp_loop, args=(ramp, start, shape, resolution, duration, checkpoint_every), name=f"M69920_ramp_{self.device_id}", daemon=True).start()
+        logger.info(f"    M69920 ramping from {start} to {target} in {n_steps} steps over {duration:.1f}s.")
+        return ramp
+
+    def _ramp_loop(self, ramp:RAMP, start:float, shape, resolution:float, duration:float, checkpoint_every:int) -> None:
+        try:
+            t0 = time.monotonic()
+            for index in range(1, ramp.n_steps + 1):
+                fraction = index / ramp.n_steps
+                # Wait for the step time, waking up early on cancellation.
+                if ramp._cancel.wait(max(0.0, t0 + duration * fraction - time.monotonic())):
+                    break
+                value = start + (ramp.target - start) * shape(fraction)
+                self._write_preset(round(value / resolution) * resolution)
+                ramp.value = self.preset_current if self.mode == self.SUPPLY_MODE.CURRENT_MODE else self.preset_power
+                ramp.steps_done = index
+                if index % checkpoint_every == 0 and index != ramp.n_steps:
+                    self._verify_preset(ramp.value)
+            ramp.future.set_result(self._verify_preset(ramp.value))
+            logger.success(f"    M69920 ramp {'cancelled' if ramp.cancelled() else 'done'} at {ramp.value}.")
+        except Exception as e:
+            logger.error(f"    M69920 ramp stopped by {type(e)} at {ramp.value}!")
+            ramp.future.set_exception(e)
+        pass
+
+    def _write_preset(self, value:float) -> None:
+        # Write the preset of the active mode, checked by its event status reply only.
+        if self.mode == self.SUPPLY_MODE.CURRENT_MODE:
+            self._command(f'A-PRESET={value:.1f}')
+            self.preset_current = round(value, 1)
+        else:
+            self._command(f'P-PRESET={int(value):04d}')
+            self.preset_power = int(value)
+        pass
+
+    def _verify_preset(self, value:float) -> float:
+        # Checkpoint: read back the preset register of the active mode and the status byte.
+        if self.mode == self.SUPPLY_MODE.CURRENT_MODE:
+            read_back = self._read_set_current()
+        else:
+            read_back = self._read_set_power()
+        self._update_lamp_op_status()
+        if read_back != value:
+            logger.error(f"    M69920 preset read back {read_back} instead of {value}!")
+            raise bsl_type.DeviceInconsistentError
+        return read_back
+
     def _get_lamp_id(self):
         pass
     
     def lamp_shut_down(self) -> None:
         self.lamp_OFF()
-        self.set_lamp_current(0.0)
-        self.set_lamp_power(0.0)
+        if self.mode == self.SUPPLY_MODE.CURRENT_MODE:
+            self.set_lamp_current(0.0)
+        else:
+            self.set_lamp_power(0)
         self.unlock_front_panel()
         pass
 
     def close(self) -> None:
+        if self._ramp is not None:
+            self._ramp.cancel()
+            self._ramp.future.exception()
+        self.stop_monitor()
         if self.serial_port is not None:
             self.lamp_shut_down()
             self.serial.close()
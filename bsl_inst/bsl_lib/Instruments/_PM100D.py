@@ -1,21 +1,118 @@
 from loguru import logger
 import time
 import sys
+import threading
+import typing
+import math
+import statistics
+import os
+import numpy as np
+from numpy.typing import NDArray
 
 from ..Interface._bsl_visa import bsl_visa
 from .._bsl_inst_info import bsl_inst_info_list as inst
 from .._bsl_type import bsl_type
+from .._bsl_inst_discovery import select_handle
+from .._bsl_ring_buffer import bsl_ring_buffer
+from .._bsl_stats import bsl_stats
+from .._bsl_retry import bsl_retry_policy
+from .._bsl_inst_cache import discovery_cache
 
 logger_opt = logger.opt(ansi=True)
 
 @logger.catch(exclude=(bsl_type.DeviceConnectionFailed,bsl_type.DeviceInconsistentError,bsl_type.DeviceOperationError))
 class PM100D:
-    def __init__(self, device_sn:str="") -> None:
+    class SNAPSHOT(typing.NamedTuple):
+        """Immutable record of the power meter configuration and measurements."""
+        timestamp: float
+        wavelength: float
+        attenuation_dB: float
+        average_count: int
+        power_range: float
+        auto_range: bool
+        zero_magnitude: float
+        zero_state: bool
+        photodiode_response: float
+        current_range: float
+        sensor_id: str
+        power: float
+        frequency: float
+        current: float
+
+    class SWEEP(typing.NamedTuple):
+        """Result of a wavelength sweep, one entry per point."""
+        wavelength: NDArray[np.float64]
+        mean: NDArray[np.float64]
+        std: NDArray[np.float64]
+        timestamp: NDArray[np.float64]
+        duration: NDArray[np.float64]
+
+    class ADAPTIVE(typing.NamedTuple):
+        """Result of an adaptive measurement."""
+        power: float
+        std_error: float
+        average_count: int
+        n_readings: int
+        duration: float
+
+    # Retry policy of the VISA session, transient timeouts are retried within milliseconds.
+    RETRY_POLICY = bsl_retry_policy(max_attempts=10, base_delay_s=0.002, max_delay_s=0.1, deadline_s=2.0)
+
+    # Approximate duration of a single measurement in seconds, see `get_average_count`.
+    MEASUREMENT_TIME_S = 0.003
+    # Transfer and processing time allowed on top of the measurement time of a query.
+    READ_TIMEOUT_MARGIN_S = 1.0
+    # Upper bound of `READ?` queries joined into one compound message, see `_reads_per_batch`.
+    SWEEP_READS_PER_BATCH = 32
+    # Tolerance between the requested and the confirmed wavelength of a sweep point, in nm.
+    SWEEP_WAVELENGTH_TOL_NM = 0.5
+
+    # Pilot readings taken at an average count of 1 to estimate the noise of an adaptive measurement.
+    ADAPTIVE_PILOT_READINGS = 4
+    # Upper bound of the average count and of the readings of an adaptive measurement.
+    ADAPTIVE_MAX_COUNT = 3000
+    ADAPTIVE_MAX_READINGS = 1000
+
+    # Wavelength step of the responsivity table, and directory of the tables kept on disk.
+    RESPONSIVITY_STEP_NM = 5.0
+    RESPONSIVITY_DIR = os.path.join(os.path.dirname(discovery_cache.path), "responsivity")
+    # Process-wide responsivity tables by sensor ID, see `get_responsivity_table`.
+    _responsivity_tables = dict()
+
+    # Mirrored configuration fields, a subset of `SNAPSHOT` fields.
+    _CONFIG_FIELDS = ("wavelength", "attenuation_dB", "average_count", "power_range", "auto_range", "sensor_id")
+
+    # SCPI queries of a snapshot, in the field order of `SNAPSHOT` after `timestamp`.
+    _SNAPSHOT_QUERIES = (
+        ("SENS:CORR:WAV?", float),
+        ("SENS:CORR:LOSS:INP:MAGN?", float),
+        ("SENS:AVER:COUNt?", int),
+        ("SENS:POW:RANG:UPP?", float),
+        ("SENS:POW:RANG:AUTO?", lambda resp: bool(int(resp))),
+        ("SENS:CORR:COLL:ZERO:MAGN?", float),
+        ("SENS:CORR:COLL:ZERO:STAT?", lambda resp: bool(int(resp))),
+        ("SENS:CORR:POW:PDIOde:RESP?", float),
+        ("SENS:CURR:RANG:UPP?", float),
+        ("SYST:SENS:IDN?", lambda resp: resp.split(",")[0]),
+        ("MEAS:POW?", float),
+        ("MEAS:FREQ?", float),
+        ("MEAS:CURR?", float),
+    )
+
+    def __init__(self, device_sn:str="", *, handles:dict=None) -> None:
         logger_opt.info(f"Initiating bsl_instrument - PM100D({device_sn})...")
         self.device_id=""
-        if self._com_connect(device_sn):
-            self.run_update_power_meter()
-            logger_opt.success(f"READY - Thorlab PM100D Power Meter \"{self.device_id}\" with sensor \"{self.get_sensor_id()}\".\n\n\n")
+        self.inst = inst.PM100D
+        self._stream_thread = None
+        self._stream_stop = threading.Event()
+        self.stream_buffer = None
+        # Streaming statistics fed with every power reading, see `attach_stats`.
+        self._power_stats = list()
+        # Local mirror of the configuration, updated on writes and served unless `force=True`.
+        self._config = dict()
+        if self._com_connect(device_sn, handles):
+            snapshot = self.run_update_power_meter()
+            logger_opt.success(f"READY - Thorlab PM100D Power Meter \"{self.device_id}\" with sensor \"{snapshot.sensor_id}\".\n\n\n")
         else:
             logger_opt.error(f"FAILED to connect to Thorlab PM100D ({device_sn}) Power Meter!\n\n\n")
             raise bsl_type.DeviceConnectionFailed
@@ -25,39 +122,93 @@ class PM100D:
         self.close()
         return None
 
-    def _com_connect(self, device_sn:str) -> bool:
+    def _com_connect(self, device_sn:str, handles:dict=None) -> bool:
+        # A (re)connected meter may have been reconfigured, the mirror is rebuilt by the next snapshot.
+        self._config = dict()
         try:
-            self._com = bsl_visa(inst.PM100D, device_sn)
+            self._com = bsl_visa(inst.PM100D, device_sn, handle=select_handle(handles, inst.PM100D, device_sn))
         except Exception as e:
             logger.error(f"{type(e)}")
             sys.exit(-1)
             
         if self._com.com_port is None:
             return False
+        self._com.retry_policy = self.RETRY_POLICY
         self.device_id = self._com.device_id
         return True
 
-    def run_update_power_meter(self) -> None:
-        """
-        - Performs an update to all relevent power meter parameters.
-
-        - Enable info level loggging to see each query results.
-        """
-        self.get_preset_wavelength()
-        self.get_attenuation_dB()
-        self.get_average_count()
-        self.get_measured_power()
-        self.get_power_measuring_range()
-        self.get_auto_range_status()
-        self.get_measured_frequency()
-        self.get_zero_magnitude()
-        self.get_zero_state()
-        self.get_photodiode_response()
-        self.get_current_range()
-        self.get_sensor_id()
-        self.get_measured_current()
+    def run_update_power_meter(self) -> SNAPSHOT:
+        """
+        - Performs an update to all relevent power meter parameters,
+        see `snapshot`.
+
+        - Enable info level loggging to see the results.
+        """
+        snapshot = self.snapshot()
+        self._raise_info(f"Status snapshot: {snapshot}")
+        return snapshot
+
+    def snapshot(self, *, joined:bool=True) -> SNAPSHOT:
+        """
+        - Fetch all configuration and measurement fields of the power
+        meter in a single `;`-joined SCPI transaction. Nothing is logged
+        above debug level, cheap enough to be called every loop iteration.
+
+        - While streaming, the `MEAS:*` fields (power, frequency, current)
+        are skipped and left None, since they would reconfigure the meter.
+
+        Parameters
+        ----------
+        joined : `bool`
+            (default to True)
+            Send one compound query, otherwise query the fields one by one.
+
+        Returns
+        --------
+        snapshot : `PM100D.SNAPSHOT`
+            Immutable record of all fields with a `time.monotonic()` timestamp.
+        """
+        queries = self._SNAPSHOT_QUERIES
+        if self._stream_thread is not None:
+            queries = [(query, parse) for (query, parse) in queries if not query.startswith("MEAS:")]
+        resps = iter(self._com.query_batch([query for (query, _) in queries], joined=joined))
+        timestamp = time.monotonic()
+        snapshot = self.SNAPSHOT(timestamp, *[parse(next(resps)) if (query, parse) in queries else None for (query, parse) in self._SNAPSHOT_QUERIES])
+        if snapshot.sensor_id != self._config.get("sensor_id"):
+            # The wavelength range belongs to the sensor, re-read it on the next use.
+            self._config.pop("wavelength_range", None)
+        self._config.update({field: getattr(snapshot, field) for field in self._CONFIG_FIELDS})
+        self._raise_debug(f"Status snapshot acquired.")
+        return snapshot
+
+    def revalidate_config(self) -> dict:
+        """
+        - Re-read all mirrored configuration fields from the power meter
+        in a single transaction, e.g. after zeroing or reconnecting.
+
+        Returns
+        --------
+        config : `dict`
+            Copy of the refreshed configuration mirror.
+        """
+        queries = [(field, query, parse) for (field, (query, parse)) in zip(self.SNAPSHOT._fields[1:], self._SNAPSHOT_QUERIES) if field in self._CONFIG_FIELDS]
+        resps = self._com.query_batch([query for (_, query, _) in queries])
+        self._config = {field: parse(resp) for ((field, _, parse), resp) in zip(queries, resps)}
+        self._raise_debug(f"Configuration mirror revalidated: {self._config}")
+        return dict(self._config)
+
+    def _check_not_streaming(self, action:str) -> None:
+        # Calls reconfiguring the measurement would turn the streamed powers into other quantities.
+        if self._stream_thread is not None:
+            self._raise_error(f"Stop streaming before {action}.")
         pass
 
+    def _mirrored(self, field:str, force:bool):
+        # Mirrored value of `field`, None if it must be queried from the power meter.
+        if force:
+            return None
+        return self._config.get(field)
+
     def run_zero(self) -> None:
         """
         - Zero the power meter.
@@ -65,42 +216,75 @@ class PM100D:
         resp = self._com.write("SENS:CORR:COLL:ZERO:INIT")
         time.sleep(0.2)
         self._raise_info("Power Meter Zeroed.")
+        self.revalidate_config()
         return None
 
-    def get_preset_wavelength(self) -> float:
+    def get_preset_wavelength(self, force:bool=False) -> float:
         """
         - Get preset wavelength of interest for power measurement 
         from the power meter.
 
+        Parameters
+        ----------
+        force : `bool`
+            (default to False)
+            Query the power meter even if the value is mirrored locally.
+
         Returns
         --------
         wavelength : `float`
             Preset wavelength of interest for power measurement.
         """
-        try_count = 0
-        while True:
-            try:
-                wavelength = float(self._com.query("SENS:CORR:WAV?"))
-                self._raise_info( f"Current preset wavelenght: {repr(wavelength)}nm")
-                break
-            except:
-                if try_count > 9:
-                    self._raise_error("FAILED to acquire wavelength.")
-                else:
-                    time.sleep(0.1)  #take a rest..
-                    try_count = try_count + 1
-                    self._raise_warning("timeout - Trying to get the wavelength again..")
+        wavelength = self._mirrored("wavelength", force)
+        if wavelength is not None:
+            return wavelength
+        try:
+            wavelength = self._com.query("SENS:CORR:WAV?", parse=float)
+        except Exception:
+            self._raise_error("FAILED to acquire wavelength.")
+        self._raise_info( f"Current preset wavelenght: {repr(wavelength)}nm")
+        self._config["wavelength"] = wavelength
         return wavelength
+
+    def get_wavelength_range(self, force:bool=False) -> tuple[float, float]:
+        """
+        - Get the wavelength range supported by the connected sensor.
+
+        Parameters
+        ----------
+        force : `bool`
+            (default to False)
+            Query the power meter even if the value is mirrored locally.
+
+        Returns
+        --------
+        (wl_min, wl_max) : `tuple[float, float]`
+            Lowest and highest settable wavelength in nm.
+        """
+        wavelength_range = self._mirrored("wavelength_range", force)
+        if wavelength_range is not None:
+            return wavelength_range
+        wavelength_range = tuple(float(resp) for resp in self._com.query_batch(["SENS:CORR:WAV? MIN", "SENS:CORR:WAV? MAX"]))
+        self._raise_debug(f"Sensor wavelength range: {wavelength_range[0]:.1f}-{wavelength_range[1]:.1f}nm.")
+        self._config["wavelength_range"] = wavelength_range
+        return wavelength_range
     
-    def set_preset_wavelength(self, wl:float) -> float:
+    def set_preset_wavelength(self, wl:float, verify:bool=False) -> float:
         """
         - Set preset wavelength of interest for power measurement 
         from the power meter.
 
+        - Wavelengths outside the range of the sensor, see
+        `get_wavelength_range`, are refused instead of being mirrored.
+
         Parameters
         ----------
         wl : `float`
             Wavelength of interest for power measurement.
+        verify : `bool`
+            (default to False)
+            Read the wavelength back from the power meter instead of
+            serving the mirrored value.
 
         Returns
         --------
@@ -108,54 +292,69 @@ class PM100D:
             Preset wavelength of interest for power measurement readback
             from the power meter.
         """
-        try_count = 0
-        while True:
-            try:
-                self._com.write("SENS:CORR:WAV %f" % wl)
-                time.sleep(0.005) # Sleep for 5 ms before rereading the wl.
-                self._raise_info(f"Wavelength set to {wl:.1f}nm")
-                break
-            except:
-                if try_count > 9:
-                    self._raise_error( "Failed to set wavelength." )
-                else:
-                    time.sleep(0.1)  #take a rest..
-                    try_count = try_count + 1
-                    self._raise_warning( "Timeout - trying to set wavelength again.." )
-
-        return self.get_preset_wavelength()
+        (wl_min, wl_max) = self.get_wavelength_range()
+        if not wl_min <= wl <= wl_max:
+            self._raise_error(f"Wavelength {wl:.1f}nm outside the sensor range {wl_min:.1f}-{wl_max:.1f}nm.")
+        try:
+            self._com.write("SENS:CORR:WAV %f" % wl)
+        except Exception:
+            self._raise_error( "Failed to set wavelength." )
+        self._raise_info(f"Wavelength set to {wl:.1f}nm")
+
+        self._config["wavelength"] = float(wl)
+        return self.get_preset_wavelength(force=verify)
     
-    def get_attenuation_dB(self) -> float:
+    def get_attenuation_dB(self, force:bool=False) -> float:
         """
         - Get current dB attenuation from the power meter.
 
+        Parameters
+        ----------
+        force : `bool`
+            (default to False)
+            Query the power meter even if the value is mirrored locally.
+
         Returns
         --------
         att_dB : `float`
             Current dB attenuation of the power meter.
         """
+        attenuation_dB = self._mirrored("attenuation_dB", force)
+        if attenuation_dB is not None:
+            return attenuation_dB
         # in dB (range for 60db to -60db) gain or attenuation, default 0 dB
         attenuation_dB = float( self._com.query("SENS:CORR:LOSS:INP:MAGN?") )
         self._raise_info(f"Current attenuation at {attenuation_dB}dB.")
+        self._config["attenuation_dB"] = attenuation_dB
         return attenuation_dB
 
-    def get_average_count(self) -> int:
+    def get_average_count(self, force:bool=False) -> int:
         """
         - Get measurments count for each power measurement. 
 
         - Each measurement is approximately 3 ms.
 
+        Parameters
+        ----------
+        force : `bool`
+            (default to False)
+            Query the power meter even if the value is mirrored locally.
+
         Returns
         --------
         count : `int`
             Number of measurements made for each power measurement,
             the result is the average of all measurements.
         """
+        average_count = self._mirrored("average_count", force)
+        if average_count is not None:
+            return average_count
         average_count = int( self._com.query("SENS:AVER:COUNt?") )
         self._raise_info( f"Current average count: {average_count}.")
+        self._config["average_count"] = average_count
         return average_count
     
-    def set_average_count(self, cnt:int) -> int:
+    def set_average_count(self, cnt:int, verify:bool=False) -> int:
         """
         - Set measurments count for each power measurement,
         the final power measurement is the average of all 
@@ -168,10 +367,17 @@ class PM100D:
         cnt : `int`
             Number of measurements made for each power measurement,
             the result is the average of all measurements.
+        verify : `bool`
+            (default to False)
+            Read the count back from the power meter instead of
+            serving the mirrored value.
         """
+        # The stream timeout is sized to the average count it was started with.
+        self._check_not_streaming("changing the average count")
         self._com.write("SENS:AVER:COUNT %i" % cnt)
         self._raise_info(f"Average count is set to {cnt}.")
-        return self.get_average_count()
+        self._config["average_count"] = int(cnt)
+        return self.get_average_count(force=verify)
             
     def get_measured_power(self) -> float:
         """
@@ -189,20 +395,67 @@ class PM100D:
         """
         power = float(self._com.query("MEAS:POW?"))
         self._raise_info(f"Current Power measured: {power*1000:.2f}mW.")
+        self._record_power(power)
         return power
+
+    def attach_stats(self, stats:bsl_stats=None) -> bsl_stats:
+        """
+        - Feed every power reading of `get_measured_power` and of the
+        background streaming into a streaming statistics accumulator.
+
+        Parameters
+        ----------
+        stats : `bsl_stats`
+            (default to a new `bsl_stats`)
+            Accumulator to be attached.
+
+        Returns
+        --------
+        stats : `bsl_stats`
+            The attached accumulator, see `bsl_stats.snapshot`.
+        """
+        if stats is None:
+            stats = bsl_stats()
+        self._power_stats.append(stats)
+        return stats
+
+    def detach_stats(self, stats:bsl_stats) -> None:
+        """
+        - Stop feeding an attached accumulator, its statistics are kept.
+        """
+        if stats in self._power_stats:
+            self._power_stats.remove(stats)
+        pass
+
+    def _record_power(self, power:float) -> None:
+        for stats in self._power_stats:
+            stats.update(power)
+        pass
         
     #un tested
-    def get_power_measuring_range(self) -> int:
+    def get_power_measuring_range(self, force:bool=False) -> int:
         """
         - ???
 
+        - Only mirrored while auto-ranging is known to be off.
+
+        Parameters
+        ----------
+        force : `bool`
+            (default to False)
+            Query the power meter even if the value is mirrored locally.
+
         Returns
         --------
         range : `int`
             ???
         """
+        power_range = self._mirrored("power_range", force or self._config.get("auto_range") is not False)
+        if power_range is not None:
+            return power_range
         power_range = float(self._com.query("SENS:POW:RANG:UPP?")) # CHECK RANGE
         self._raise_info(f"Power measuring range: {power_range*1000:.1f}mW.")
+        self._config["power_range"] = power_range
         return power_range
 
     #un tested
@@ -217,20 +470,33 @@ class PM100D:
         """
         self._com.write("SENS:POW:RANG:UPP {}".format(range))
         self._raise_info(f"Set Power_measuring_range to {range}mW.")
+        # The meter picks the closest available range and drops auto-ranging, re-read both on demand.
+        self._config.pop("power_range", None)
+        self._config.pop("auto_range", None)
         pass
 
-    def get_auto_range_status(self) -> bool:
+    def get_auto_range_status(self, force:bool=False) -> bool:
         """
         - Get the status of auto-ranging feature of the power meter.
 
+        Parameters
+        ----------
+        force : `bool`
+            (default to False)
+            Query the power meter even if the value is mirrored locally.
+
         Returns
         --------
         auto-range : `bool`
             The status of auto-ranging feature of the power meter.
         """
+        auto_range = self._mirrored("auto_range", force)
+        if auto_range is not None:
+            return auto_range
         resp = self._com.query("SENS:POW:RANG:AUTO?")
         auto_range = bool(int(resp))
-        self._raise_info(f"Current Auto_range status: {repr(self.auto_range)}.")
+        self._raise_info(f"Current Auto_range status: {repr(auto_range)}.")
+        self._config["auto_range"] = auto_range
         return auto_range
     
     def set_auto_range(self, auto:bool = True) -> None:
@@ -247,6 +513,8 @@ class PM100D:
             self._com.write("SENS:POW:RANG:AUTO ON") # turn on auto range
         else:
             self._com.write("SENS:POW:RANG:AUTO OFF") # turn off auto range
+        self._config["auto_range"] = bool(auto)
+        self._config.pop("power_range", None)
     
     def get_measured_frequency(self) -> float:
         """
@@ -257,6 +525,7 @@ class PM100D:
         freq : `float`
             Measured frequency `Hz` from the power meter.
         """
+        self._check_not_streaming("measuring the frequency")
         frequency = float(self._com.query("MEAS:FREQ?"))
         self._raise_info(f"Measured frequency: {frequency:.1f}Hz.")
         return frequency
@@ -314,9 +583,10 @@ class PM100D:
         current : `float`
             Current measured_current magnitude in `Amps`.
         """
+        self._check_not_streaming("measuring the current")
         resp = self._com.query("MEAS:CURR?")
         current = float(resp)
-        self._raise_info(f"Measured current: {self.current*1000:.1f}mA.")
+        self._raise_info(f"Measured current: {current*1000:.1f}mA.")
         return current
     
     def get_current_range(self) -> float:
@@ -333,20 +603,391 @@ class PM100D:
         self._raise_info(f"Preset current_range: {current_range*1000:.1f}mA.")
         return current_range
 
-    def get_sensor_id(self) -> str:
+    def get_responsivity_table(self, wavelengths=None, *, rebuild:bool=False) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        - Get the responsivity (`A/W`) against wavelength of the attached
+        sensor, built once per sensor ID and cached in memory and on disk
+        under `RESPONSIVITY_DIR`.
+
+        - Building steps the preset wavelength through `wavelengths` with
+        one compound message per batch of points, then restores it.
+
+        Parameters
+        ----------
+        wavelengths : `array_like`
+            (default to the sensor range in `RESPONSIVITY_STEP_NM` steps)
+            Wavelengths in nm of the table to be built, within the sensor
+            range, see `get_wavelength_range`.
+        rebuild : `bool`
+            (default to False)
+            Rebuild the table even if it is cached.
+
+        Returns
+        --------
+        (wavelengths, responsivity) : `tuple[numpy.ndarray, numpy.ndarray]`
+            Ascending wavelengths in nm and responsivity in `A/W`.
+        """
+        sensor_id = self.get_sensor_id()
+        path = os.path.join(self.RESPONSIVITY_DIR, f"{sensor_id}.npz")
+        if not rebuild:
+            if sensor_id in self._responsivity_tables:
+                return self._responsivity_tables[sensor_id]
+            try:
+                with np.load(path) as table:
+                    self._responsivity_tables[sensor_id] = (table["wavelength"], table["responsivity"])
+                self._raise_debug(f"Responsivity table of {sensor_id} loaded from {path}.")
+                return self._responsivity_tables[sensor_id]
+            except (OSError, KeyError, ValueError):
+                pass
+
+        self._check_not_streaming("building a responsivity table")
+        (wl_min, wl_max) = self.get_wavelength_range()
+        if wavelengths is None:
+            # Steps from the lower bound, the upper bound is always the last point.
+            wavelengths = np.append(np.arange(wl_min, wl_max - self.RESPONSIVITY_STEP_NM / 2, self.RESPONSIVITY_STEP_NM), wl_max)
+        wavelengths = np.sort(np.asarray(wavelengths, dtype=np.float64).ravel())
+        if len(wavelengths) > 0 and (wavelengths[0] < wl_min or wavelengths[-1] > wl_max):
+            self._raise_error(f"Wavelengths {wavelengths[0]:.1f}-{wavelengths[-1]:.1f}nm outside the sensor range {wl_min:.1f}-{wl_max:.1f}nm.")
+        responsivity = np.empty_like(wavelengths)
+        preset_wavelength = self.get_preset_wavelength()
+        try:
+            for start in range(0, len(wavelengths), self.SWEEP_READS_PER_BATCH):
+                chunk = wavelengths[start:start+self.SWEEP_READS_PER_BATCH]
+                msg = ";:".join(f"SENS:CORR:WAV {wl:f};:SENS:CORR:POW:PDIOde:RESP?" for wl in chunk)
+                responsivity[start:start+len(chunk)] = self._com.query(msg, parse=lambda resp: [float(field) for field in resp.strip().split(";")])
+        finally:
+            self.set_preset_wavelength(preset_wavelength)
+
+        self._responsivity_tables[sensor_id] = (wavelengths, responsivity)
+        try:
+            os.makedirs(self.RESPONSIVITY_DIR, exist_ok=True)
+            np.savez(path, wavelength=wavelengths, responsivity=responsivity)
+        except OSError as e:
+            self._raise_warning(f"Failed to store responsivity table to {path}: {e}")
+        self._raise_info(f"Responsivity table of {sensor_id} built over {wavelengths[0]:.0f}-{wavelengths[-1]:.0f}nm.")
+        return (wavelengths, responsivity)
+
+    def current_to_power(self, current, wavelength) -> NDArray[np.float64]:
+        """
+        - Convert photodiode currents to powers locally, with the
+        responsivity table of the attached sensor interpolated at
+        `wavelength`. Both arguments are broadcast against each other.
+
+        Parameters
+        ----------
+        current : `array_like`
+            Photodiode currents in `Amps`.
+        wavelength : `array_like`
+            Wavelengths in nm of the light producing `current`.
+
+        Returns
+        --------
+        power : `numpy.ndarray`
+            Powers in `Watts`.
+        """
+        (table_wavelength, table_responsivity) = self.get_responsivity_table()
+        wavelength = np.asarray(wavelength, dtype=np.float64)
+        if np.any(wavelength < table_wavelength[0]) or np.any(wavelength > table_wavelength[-1]):
+            self._raise_warning(f"Wavelength outside of the responsivity table {table_wavelength[0]:.0f}-{table_wavelength[-1]:.0f}nm, clamped.")
+        return np.asarray(current, dtype=np.float64) / np.interp(wavelength, table_wavelength, table_responsivity)
+
+    def sample_current(self, n:int) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        - Sample `n` photodiode currents back to back, with the meter
+        configured once for current measurement and the `READ?` queries
+        batched into compound messages. Use `current_to_power` to get
+        powers without reconfiguring the preset wavelength.
+
+        Returns
+        --------
+        (timestamps, currents) : `tuple[numpy.ndarray, numpy.ndarray]`
+            `time.monotonic()` timestamps spread over each batch, and
+            currents in `Amps`.
+        """
+        self._check_not_streaming("sampling currents")
+        timestamps = np.empty(n, dtype=np.float64)
+        currents = np.empty(n, dtype=np.float64)
+        average_count = self.get_average_count()
+        self._com.write("CONF:CURR")
+        with self._com.timeout_at_least(self._read_timeout_ms(average_count)):
+            reads_per_batch = self._reads_per_batch(average_count)
+            for start in range(0, n, reads_per_batch):
+                n_batch = min(reads_per_batch, n - start)
+                batch_start = time.monotonic()
+                currents[start:start+n_batch] = [float(resp) for resp in self._com.query_batch(["READ?"] * n_batch)]
+                timestamps[start:start+n_batch] = np.linspace(batch_start, time.monotonic(), n_batch + 1)[1:]
+        self._raise_debug(f"{n} currents sampled in {(timestamps[-1] - timestamps[0])*1000 if n > 0 else 0:.1f}ms.")
+        return (timestamps, currents)
+
+    def get_sensor_id(self, force:bool=False) -> str:
         """
         - Get the sensor_id from the power meter.
 
+        Parameters
+        ----------
+        force : `bool`
+            (default to False)
+            Query the power meter even if the value is mirrored locally.
+
         Returns
         --------
         sensor_id : `str`
             Sensor ID of the currently connected sensor.
         """
+        sensor_id = self._mirrored("sensor_id", force)
+        if sensor_id is not None:
+            return sensor_id
         sensor_id = self._com.query("SYST:SENS:IDN?").split(",")[0]
         self._raise_info(f"Current connected sensor: {sensor_id}.")
+        self._config["sensor_id"] = sensor_id
         return sensor_id
 
 
+    def measure_adaptive(self, target_rse:float=None, time_budget_s:float=None, *, ci_width:float=None, confidence:float=0.95) -> ADAPTIVE:
+        """
+        - Measure the power with an average count picked for the reading
+        at hand, so dim readings get more averaging and bright ones
+        return right after a short pilot.
+
+        - A pilot of `ADAPTIVE_PILOT_READINGS` readings at an average count
+        of 1 estimates the relative noise of a single measurement, from
+        which the average count reaching `target_rse` is derived. The
+        count is capped by `time_budget_s`, about 3 ms per measurement.
+
+        - With `ci_width`, readings are repeated at the chosen count until
+        the relative half-width of the `confidence` interval of the mean
+        drops below `ci_width` (sequential stopping), or the time budget
+        is spent. The chosen average count stays configured afterwards.
+
+        Parameters
+        ----------
+        target_rse : `float`
+            (default to None)
+            Target relative standard error of the result, e.g. 1e-3.
+            Without it, the whole time budget is spent averaging.
+        time_budget_s : `float`
+            (default to None)
+            Time budget of the measurement in seconds.
+        ci_width : `float`
+            (default to None)
+            Relative half-width of the confidence interval to be reached
+            by sequential sampling, disabled if None.
+        confidence : `float`
+            (default to 0.95)
+            Confidence level of `ci_width`.
+
+        Returns
+        --------
+        result : `PM100D.ADAPTIVE`
+            Power in `Watts`, its estimated standard error, the average
+            count and number of readings used, and the duration in seconds.
+        """
+        if target_rse is None and time_budget_s is None:
+            self._raise_error("Either a target relative standard error or a time budget is required.")
+        self._check_not_streaming("an adaptive measurement")
+        start = time.monotonic()
+        deadline = math.inf if time_budget_s is None else start + time_budget_s
+
+        self._com.write("CONF:POW")
+        self.set_average_count(1)
+        readings = [float(resp) for resp in self._com.query_batch(["READ?"] * self.ADAPTIVE_PILOT_READINGS)]
+        mean = statistics.fmean(readings)
+        rel_sd = statistics.stdev(readings) / abs(mean) if mean != 0 else math.inf
+        if target_rse is not None and rel_sd / math.sqrt(len(readings)) <= target_rse and ci_width is None:
+            return self._adaptive_result(readings, 1, start, rel_sd)
+
+        remaining_count = max(1, int((deadline - time.monotonic()) / self.MEASUREMENT_TIME_S)) if time_budget_s is not None else self.ADAPTIVE_MAX_COUNT
+        count = remaining_count if target_rse is None else math.ceil((rel_sd / target_rse) ** 2) if math.isfinite(rel_sd) else self.ADAPTIVE_MAX_COUNT
+        count = max(1, min(count, remaining_count, self.ADAPTIVE_MAX_COUNT))
+        self.set_average_count(count)
+        self._raise_debug(f"Pilot relative noise {rel_sd:.2e}, average count {count} chosen.")
+
+        with self._com.timeout_at_least(self._read_timeout_ms(count)):
+            readings = [float(self._com.query("READ?"))]
+            if ci_width is not None:
+                z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+                while len(readings) < self.ADAPTIVE_MAX_READINGS:
+                    if len(readings) > 1:
+                        mean = statistics.fmean(readings)
+                        if mean != 0 and z * statistics.stdev(readings) / math.sqrt(len(readings)) / abs(mean) <= ci_width:
+                            break
+                    if time.monotonic() + count * self.MEASUREMENT_TIME_S > deadline:
+                        break
+                    readings.append(float(self._com.query("READ?")))
+        result = self._adaptive_result(readings, count, start, rel_sd / math.sqrt(count))
+        self._raise_info(f"Adaptive power {result.power*1000:.4f}mW +/- {result.std_error*1000:.1e}mW, {result.n_readings} readings at average count {count}.")
+        return result
+
+    def _read_timeout_ms(self, count:int, n_reads:int=1) -> float:
+        # Session timeout in ms covering `n_reads` readings at an average count of `count`.
+        return (n_reads * count * self.MEASUREMENT_TIME_S + self.READ_TIMEOUT_MARGIN_S) * 1000
+
+    def _reads_per_batch(self, count:int) -> int:
+        # `READ?` queries at an average count of `count` answered within the session timeout, at least one.
+        timeout = self._com.com_port.timeout
+        if timeout is None:
+            return self.SWEEP_READS_PER_BATCH
+        n_reads = int((timeout / 1000 - self.READ_TIMEOUT_MARGIN_S) / (count * self.MEASUREMENT_TIME_S))
+        return max(1, min(self.SWEEP_READS_PER_BATCH, n_reads))
+
+    def _adaptive_result(self, readings:list[float], count:int, start:float, rel_sd:float) -> ADAPTIVE:
+        # Standard error from the spread of the readings, or from the relative noise `rel_sd` of a single reading.
+        power = statistics.fmean(readings)
+        if len(readings) > 1:
+            std_error = statistics.stdev(readings) / math.sqrt(len(readings))
+        else:
+            std_error = abs(power) * rel_sd
+        return self.ADAPTIVE(power, std_error, count, len(readings), time.monotonic() - start)
+
+    def sweep(self, wavelengths, samples_per_point:int=1) -> SWEEP:
+        """
+        - Measure the power at every wavelength of `wavelengths`.
+
+        - The measurement is configured once, then every point costs a
+        single compound message holding the wavelength setting, its
+        read-back and the `READ?` samples, so setting and measuring share
+        one round trip. The meter processes the message in order, so the
+        read-back confirms the setting before sampling and no fixed
+        settling sleep is needed.
+
+        Parameters
+        ----------
+        wavelengths : `array_like`
+            Wavelengths in nm, measured in the given order.
+        samples_per_point : `int`
+            (default to 1)
+            Number of power readings per point, each averaging
+            `average_count` individual measurements.
+
+        Returns
+        --------
+        sweep : `PM100D.SWEEP`
+            Confirmed wavelengths, mean and standard deviation of the powers
+            in `Watts`, `time.monotonic()` timestamp at the end of each point
+            and the time spent on each point in seconds.
+        """
+        self._check_not_streaming("sweeping")
+        wavelengths = np.asarray(wavelengths, dtype=np.float64).ravel()
+        n_points = len(wavelengths)
+        result = self.SWEEP(*[np.empty(n_points, dtype=np.float64) for _ in self.SWEEP._fields])
+        powers = np.empty(samples_per_point, dtype=np.float64)
+        average_count = self.get_average_count()
+        budget = samples_per_point * average_count * self.MEASUREMENT_TIME_S
+        self._raise_info(f"Sweeping {n_points} points with {samples_per_point} samples each, about {budget*1000:.1f}ms of measurement per point.")
+
+        self._com.write("CONF:POW")
+        with self._com.timeout_at_least(self._read_timeout_ms(average_count)):
+            reads_per_batch = self._reads_per_batch(average_count)
+            for (index, wl) in enumerate(wavelengths):
+                start = time.monotonic()
+                n_read = 0
+                while n_read < samples_per_point:
+                    n_batch = min(reads_per_batch, samples_per_point - n_read)
+                    if n_read == 0:
+                        msg = ";:".join([f"SENS:CORR:WAV {wl:f}", "SENS:CORR:WAV?"] + ["READ?"] * n_batch)
+                        resps = self._com.query(msg, parse=lambda resp: [float(field) for field in resp.strip().split(";")])
+                        result.wavelength[index] = resps.pop(0)
+                    else:
+                        resps = [float(resp) for resp in self._com.query_batch(["READ?"] * n_batch)]
+                    powers[n_read:n_read+n_batch] = resps
+                    n_read += n_batch
+                result.timestamp[index] = time.monotonic()
+                result.duration[index] = result.timestamp[index] - start
+                result.mean[index] = powers.mean()
+                result.std[index] = powers.std(ddof=1) if samples_per_point > 1 else 0.0
+                if abs(result.wavelength[index] - wl) > self.SWEEP_WAVELENGTH_TOL_NM:
+                    self._raise_warning(f"Wavelength {wl:.1f}nm confirmed as {result.wavelength[index]:.1f}nm.")
+
+        if n_points > 0:
+            self._config["wavelength"] = float(result.wavelength[-1])
+            self._raise_info(f"Sweep done, {result.duration.mean()*1000:.1f}ms per point on average against a {budget*1000:.1f}ms measurement budget.")
+        return result
+
+    def start_streaming(self, capacity:int=100_000) -> bsl_ring_buffer:
+        """
+        - Configure the power meter once for power measurement and keep
+        pulling samples with the light `READ?` path in a background thread,
+        into a preallocated ring buffer with monotonic timestamps.
+
+        - No log line is emitted per sample. Foreground queries stay
+        available and are interleaved between samples, but calls
+        reconfiguring the measurement (current/frequency measurement,
+        `sample_current`, `sweep`, `measure_adaptive`, building a
+        responsivity table, changing the average count) are refused until
+        `stop_streaming`, and `snapshot` skips its `MEAS:*` fields.
+
+        - The session timeout is extended to the duration of a reading
+        at the current average count for as long as the stream runs.
+
+        Parameters
+        ----------
+        capacity : `int`
+            (default to 100000)
+            Number of latest samples kept in the ring buffer.
+
+        Returns
+        --------
+        stream_buffer : `bsl_ring_buffer`
+            Ring buffer receiving the samples, see `get_stream`.
+        """
+        if self._stream_thread is not None:
+            self._raise_warning("Streaming already running.")
+            return self.stream_buffer
+        self.stream_buffer = bsl_ring_buffer(capacity)
+        average_count = self.get_average_count()
+        self._com.write("CONF:POW")
+        self._stream_stop.clear()
+        self._stream_thread = threading.Thread(target=self._stream_loop, args=(average_count,), name=f"PM100D_stream_{self.device_id}", daemon=True)
+        self._stream_thread.start()
+        self._raise_info(f"Streaming started with a {capacity}-sample ring buffer.")
+        return self.stream_buffer
+
+    def stop_streaming(self) -> None:
+        """
+        - Stop the background acquisition, the ring buffer is kept.
+        """
+        if self._stream_thread is None:
+            return None
+        self._stream_stop.set()
+        self._stream_thread.join()
+        self._stream_thread = None
+        self._raise_info(f"Streaming stopped after {self.stream_buffer.total_count} samples.")
+        pass
+
+    def _stream_loop(self, average_count:int) -> None:
+        stream_buffer = self.stream_buffer
+        with self._com.timeout_at_least(self._read_timeout_ms(average_count)):
+            while not self._stream_stop.is_set():
+                try:
+                    power = float(self._com.query("READ?"))
+                except Exception as e:
+                    self._raise_warning(f"Streaming stopped by {type(e)}.")
+                    break
+                stream_buffer.append(time.monotonic(), power)
+                self._record_power(power)
+        pass
+
+    def get_stream(self, n:int=None) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        - Zero-copy views of the latest `n` streamed samples, oldest first.
+        Views are overwritten by later samples, use `.copy()` to keep them.
+
+        Parameters
+        ----------
+        n : `int`
+            (default to all buffered samples)
+            Number of latest samples.
+
+        Returns
+        --------
+        (timestamps, powers) : `tuple[numpy.ndarray, numpy.ndarray]`
+            `time.monotonic()` timestamps in seconds and powers in `Watts`.
+        """
+        if self.stream_buffer is None:
+            self._raise_error("Streaming was never started.")
+        (timestamps, values) = self.stream_buffer.view(n)
+        return (timestamps, values[:, 0])
+
     def _raise_error(self, msg:str=""):
         logger_opt.error(f"ERROR - {self.inst.MODEL} ({self.device_id}) - {msg}")
         raise bsl_type.DeviceOperationError
@@ -364,6 +1005,7 @@ class PM100D:
         return
 
     def close(self) -> None:
+        self.stop_streaming()
         if self._com is not None:
             self._com.close()
             del self._com
@@ -0,0 +1,132 @@
+from loguru import logger
+import time
+import threading
+import typing
+import numpy as np
+from numpy.typing import NDArray
+from concurrent.futures import ThreadPoolExecutor
+
+from .._bsl_type import bsl_type
+from .._bsl_stats import bsl_stats
+from ._PM100D import PM100D
+
+logger_opt = logger.opt(ansi=True)
+
+@logger.catch(exclude=(bsl_type.DeviceConnectionFailed,bsl_type.DeviceInconsistentError,bsl_type.DeviceOperationError))
+class PM100D_group:
+    """
+    - Synchronized sampling of several connected `PM100D` power meters,
+    e.g. reference, sample and stray-light heads.
+
+    - Every meter gets its own worker thread over its own VISA session.
+    The workers meet at a barrier and trigger their meter with `INIT`
+    at the same time, then fetch the result with `FETC?`, so the
+    timestamps of a row are only skewed by the trigger latency and not
+    by the measurement time of the other meters.
+
+    - Every row re-selects power measurement on each meter before the
+    barrier, so calls on the meters between rows cannot change what is
+    fetched.
+
+    Parameters
+    ----------
+    meters : `list[PM100D]`
+        Connected power meters, in the column order of the readings.
+    """
+    class SAMPLE(typing.NamedTuple):
+        """One row of aligned readings of the group."""
+        timestamp: NDArray[np.float64]
+        power: NDArray[np.float64]
+        skew: float
+
+    # Seconds the workers wait for each other at the trigger barrier.
+    TRIGGER_TIMEOUT_S = 5.0
+
+    def __init__(self, meters:list[PM100D]) -> None:
+        self.meters = list(meters)
+        self.device_ids = [meter.device_id for meter in self.meters]
+        # Trigger skew of every sampled row, in seconds.
+        self.skew_stats = bsl_stats()
+        self._barrier = threading.Barrier(len(self.meters), timeout=self.TRIGGER_TIMEOUT_S)
+        self._executor = ThreadPoolExecutor(max_workers=len(self.meters), thread_name_prefix="PM100D_group")
+        for meter in self.meters:
+            if meter._stream_thread is not None:
+                self._raise_error(f"Stop streaming of {meter.device_id} before grouping.")
+        logger_opt.info(f"    PM100D group of {self.device_ids} ready.")
+        pass
+
+    def __del__(self, *args, **kwargs) -> None:
+        self.close()
+        return None
+
+    def _trigger_and_fetch(self, meter:PM100D) -> tuple[float, float]:
+        # Configured ahead of the barrier so it does not add to the trigger skew,
+        # `FETC?` waits for the whole averaged measurement.
+        meter._com.write("CONF:POW")
+        with meter._com.timeout_at_least(meter._read_timeout_ms(meter.get_average_count())):
+            self._barrier.wait()
+            start = time.monotonic()
+            meter._com.write("INIT")
+            timestamp = (start + time.monotonic()) / 2
+            return (timestamp, float(meter._com.query("FETC?")))
+
+    def sample(self) -> SAMPLE:
+        """
+        - Trigger all meters together and fetch one row of readings.
+
+        Returns
+        --------
+        sample : `PM100D_group.SAMPLE`
+            Per-device `time.monotonic()` trigger timestamps, powers in
+            `Watts` and the skew between the earliest and latest trigger.
+        """
+        for meter in self.meters:
+            if meter._stream_thread is not None:
+                self._raise_error(f"Stop streaming of {meter.device_id} before group sampling.")
+        futures = [self._executor.submit(self._trigger_and_fetch, meter) for meter in self.meters]
+        try:
+            results = [future.result() for future in futures]
+        except Exception as e:
+            self._barrier.reset()
+            self._raise_error(f"Group sampling failed with {type(e)}.")
+        timestamp = np.array([timestamp for (timestamp, _) in results])
+        power = np.array([power for (_, power) in results])
+        skew = float(timestamp.max() - timestamp.min())
+        self.skew_stats.update(skew)
+        for (meter, value) in zip(self.meters, power):
+            meter._record_power(value)
+        return self.SAMPLE(timestamp, power, skew)
+
+    def sample_n(self, n:int) -> SAMPLE:
+        """
+        - Sample `n` rows back to back.
+
+        Returns
+        --------
+        samples : `PM100D_group.SAMPLE`
+            Timestamps and powers with shape (n, n_meters), and the
+            largest skew of all rows. See `skew_stats` for the distribution.
+        """
+        timestamp = np.empty((n, len(self.meters)), dtype=np.float64)
+        power = np.empty((n, len(self.meters)), dtype=np.float64)
+        skew = 0.0
+        for index in range(n):
+            sample = self.sample()
+            timestamp[index] = sample.timestamp
+            power[index] = sample.power
+            skew = max(skew, sample.skew)
+        logger_opt.info(f"    PM100D group sampled {n} rows, trigger skew {self.skew_stats.snapshot().mean*1e6:.0f}us on average.")
+        return self.SAMPLE(timestamp, power, skew)
+
+    def _raise_error(self, msg:str=""):
+        logger_opt.error(f"ERROR - PM100D group {self.device_ids} - {msg}")
+        raise bsl_type.DeviceOperationError
+
+    def close(self) -> None:
+        """
+        - Stop the worker threads, the meters stay connected.
+        """
+        if getattr(self, "_executor", None) is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        pass
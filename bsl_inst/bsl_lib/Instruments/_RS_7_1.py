@@ -1,6 +1,8 @@
 from ..Interface._bsl_serial import bsl_serial
 from .._bsl_inst_info import bsl_inst_info_list as inst
 from .._bsl_type import bsl_type
+from .._bsl_inst_discovery import select_handle
+from .._bsl_retry import bsl_retry_policy
 
 import time
 import enum
@@ -31,10 +33,20 @@ class RS_7_1:
         FWHM = list([0.0, 0.0, 13.62, 27.44, 13.62, 16.41, 30.97, 14.81, 0.0, 0.0, 22.25, 0.0, 18.07, 24.06, 0.0, 14.81, 0.0, 0.0, 35.15, 106.8, 106.8, 32.22, 25.21, 18.53, 0.0, 20.28, 79.39, 79.39, 24.06, 13.62, 0.0, 0.0, 40.32, 17.83, 0.0, 21.05, 16.15, 0.0, 33.17, 0.0, 19.7, 24.06, 21.86, 0.0, 24.06, 31.81, 16.94, 0.0, 21.27, 0.0, 20.94, 29.85, 52.46, 21.36, 21.36, 0.0, 18.53, 0.0, 15.1, 21.86, 27.68, 31.81, 0.0, 0.0])
         WAVELENGTH = list([0.0, 0.0, 590.35, 498.75, 590.35, 399.0, 521.85, 627.11, 0.0, 0.0, 769.71, 0.0, 657.0, 712.89, 0.0, 627.11, 0.0, 0.0, 845.9, 571.15, 571.15, 901.51, 746.37, 632.75, 0.0, 452.86, 610.19, 610.19, 712.89, 590.35, 5990.9, 0.0, 936.91, 426.01, 0.0, 688.43, 616.27, 2937.8, 531.37, 0.0, 445.77, 729.16, 495.49, 0.0, 729.16, 525.64, 667.09, 0.0, 407.85, 0.0, 753.59, 474.73, 959.3, 700.74, 700.74, 0.0, 632.75, 0.0, 426.8, 495.49, 802.68, 525.64, 2747.6, 0.0])
     
-    def __init__(self, device_sn="", pwr_on_test:bool = True) -> None:
+    # Retry policy of `_com_query`, unanswered queries are sent again.
+    RETRY_POLICY = bsl_retry_policy(max_attempts=3, base_delay_s=0.005, max_delay_s=0.05, deadline_s=2.0)
+
+    # Default maximum gap between two lines of the same multi-line response, see `multiline_gap_s`.
+    MULTILINE_GAP_S = 0.05
+
+    def __init__(self, device_sn="", pwr_on_test:bool = True, *, handles:dict=None) -> None:
         self._target_device_sn = device_sn
+        self._handle = select_handle(handles, inst.RS_7_1, device_sn)
         self.inst = inst.RS_7_1
         self.device_id = ""
+        # Multi-line responses (e.g. `SCP`) end with an empty line, and are also considered
+        # complete once no further line arrives within this gap in seconds. Raise it on slow links.
+        self.multiline_gap_s = self.MULTILINE_GAP_S
         logger.info(f"Initiating bsl_instrument - M69920({device_sn})...")
         self._pantone_keys = PantonePaint().keys()
         
@@ -54,7 +66,8 @@ class RS_7_1:
 
     def _serial_connect(self) -> bsl_serial:
         try:
-            com_port = bsl_serial(inst.RS_7_1, self._target_device_sn)
+            com_port = bsl_serial(inst.RS_7_1, self._target_device_sn, handle=self._handle)
+            com_port.retry_policy = self.RETRY_POLICY
         except Exception as e:
             logger.error(f"{type(e)}")
         return com_port
@@ -252,20 +265,23 @@ class RS_7_1:
         return intensity
 
     def _com_query(self, msg, timeout:float = 0.5) -> str:
+        return self._com.retry_policy.call(self._com_query_once, msg, timeout, description=lambda: f"RS_7_1 query {repr(msg)}", retry_if=lambda resp: resp == "")
+
+    def _com_query_once(self, msg, timeout:float = 0.5) -> str:
         self._com.flush_read_buffer()
-        self._com.write(msg+'\r\n')
-        resp = self._com.readline()
+        self._com._write_once(msg+'\r\n')
+        resp = self._com.readline(timeout)
         if resp == "":
-            return self._com.readline()
+            return self._com.readline(timeout)
         else:
             return resp
 
     def _com_cmd(self, msg, timeout:float = 0.5) -> int:
         self._com.flush_read_buffer()
         self._com.write(msg+'\r\n')
-        resp = self._com.readline()
+        resp = self._com.readline(timeout)
         if resp == "":
-            resp = self._com.readline()
+            resp = self._com.readline(timeout)
             if resp != "Ok":
                 logger.error(f"ERROR - {self.inst.MODEL} ({self.device_id}) - message from device: \"{resp}\"")
                 raise bsl_type.DeviceOperationError
@@ -876,15 +892,16 @@ class RS_7_1:
         chans = list()
         powers = list()
         self._set_power_unit(unit, irr_distance_mm)
-        resp = self._com_query('SCP')
+        # Every reply starts with a bare line break and a list ends with an empty line,
+        # `multiline_gap_s` of silence ends it too instead of a full read timeout.
+        resps = self._com.query_multiline('SCP', idle_timeout=self.multiline_gap_s, skip_leading_empty=True)
         
-        if resp=="":
+        if len(resps) == 0:
             self._raise_warning("All LED channels are currently OFF!")
             
-        while(resp != ""):
+        for resp in resps:
             chans.append(resp.split(',')[0])
             powers.append(resp.split(',')[1])
-            resp = self._com.readline()
             
         self._raise_debug(f"All ON LEDs power info received.")
         return (chans,powers)
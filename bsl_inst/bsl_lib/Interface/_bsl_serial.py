@@ -1,21 +1,227 @@
 from xml.dom import NoModificationAllowedErr
 from loguru import logger
 from .._bsl_inst_info import bsl_inst_info_list
+from .._bsl_inst_info_class import bsl_inst_info_class
+from .._bsl_inst_handle import bsl_inst_handle
+from .._bsl_inst_cache import discovery_cache
+from .._bsl_type import bsl_type
+from .._bsl_log import bsl_log
+from .._bsl_retry import DEFAULT_RETRY_POLICY
 
+import io
 import time
+import queue
+import asyncio
+import functools
+import threading
+import collections
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from serial.tools.list_ports import comports
 import serial
 import re
 logger_opt = logger.opt(ansi=True)
 
+# Gap in seconds after which a response is considered complete when draining the rest of a line.
+_LINE_IDLE_S = 0.02
+
+def _read_with_deadline(device:serial.Serial, *, terminator:bytes=None, n_bytes:int=None, expected:str=None, timeout:float=1.0) -> bytes:
+    # Read from `device` until the terminator, `n_bytes` bytes or a match of the
+    # `expected` regex arrives, whichever comes first, or until `timeout` seconds elapse.
+    # Returns everything received so far, possibly partial on timeout.
+    # An `expected` match may land mid-line, the rest of the line is then drained as well,
+    # so it is not taken for the start of the next response.
+    if isinstance(expected, str):
+        expected = re.compile(expected)
+    deadline = time.monotonic() + timeout
+    buffer = bytearray(n_bytes if n_bytes is not None else 256)
+    count = 0
+    matched = False
+    for count in _iter_read_with_deadline(device, buffer, n_bytes, terminator=terminator, timeout=timeout, bytewise=expected is not None):
+        if n_bytes is None and count == len(buffer):
+            buffer.extend(bytes(len(buffer)))
+        if expected is not None and expected.search(buffer[:count].decode("ascii", errors="ignore")) is not None:
+            matched = True
+            break
+    resp = bytes(buffer[:count])
+    if matched and (terminator is None or terminator not in resp):
+        resp += _drain_line(device, terminator=terminator, n_bytes=None if n_bytes is None else n_bytes - count, deadline=deadline)
+    return resp
+
+
+def _drain_line(device:serial.Serial, *, terminator:bytes=None, n_bytes:int=None, deadline:float) -> bytes:
+    # Read the rest of a line until the terminator, `n_bytes` bytes, the deadline,
+    # or until no byte arrives for `_LINE_IDLE_S` seconds.
+    tail = bytearray()
+    while n_bytes is None or len(tail) < n_bytes:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        chunk = _read_with_deadline(device, terminator=terminator, n_bytes=None if n_bytes is None else n_bytes - len(tail), timeout=min(remaining, _LINE_IDLE_S))
+        tail += chunk
+        if len(chunk) == 0 or (terminator is not None and terminator in tail):
+            break
+    return bytes(tail)
+
+
+def _readinto_with_deadline(device:serial.Serial, buffer:bytearray, n_bytes:int, *, terminator:bytes=None, timeout:float=1.0) -> int:
+    # Fill the first `n_bytes` of `buffer` in place until full or the terminator arrives,
+    # bounded by `timeout` seconds. Returns the number of bytes written into `buffer`.
+    count = 0
+    for count in _iter_read_with_deadline(device, buffer, n_bytes, terminator=terminator, timeout=timeout):
+        pass
+    return count
+
+
+def _iter_read_with_deadline(device:serial.Serial, buffer:bytearray, n_bytes:int, *, terminator:bytes=None, timeout:float=1.0, bytewise:bool=False):
+    # Core of the deadline reads, fills `buffer` in place and yields the byte count after each read.
+    # Terminated (or bytewise) reads go one byte at a time once data is waiting, so nothing past
+    # the end of the response is consumed; the port timeout is only touched when idle-waiting.
+    deadline = time.monotonic() + timeout
+    count = 0
+    search_start = 0
+    original_timeout = device.timeout
+    try:
+        while n_bytes is None or count < n_bytes:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            waiting = device.in_waiting
+            if waiting == 0:
+                device.timeout = remaining
+                waiting = 1
+            chunk_size = 1 if (terminator is not None or bytewise) else waiting
+            if n_bytes is not None:
+                chunk_size = min(chunk_size, n_bytes - count)
+            chunk_size = min(chunk_size, len(buffer) - count)
+            received = device.readinto(memoryview(buffer)[count:count+chunk_size]) or 0
+            if received == 0:
+                break
+            count += received
+            yield count
+            if terminator is not None:
+                if buffer.find(terminator, search_start, count) != -1:
+                    break
+                search_start = max(0, count - len(terminator) + 1)
+    finally:
+        device.timeout = original_timeout
+
+
+def _identify_device(inst:bsl_inst_info_class, device:serial.Serial, resp_timeout:float) -> str:
+    # Send QUERY_CMD on an open port and return the identification response.
+    device.reset_input_buffer()
+    device.write(bytes(inst.QUERY_CMD,'ascii'))
+    if bsl_log.trace_enabled:
+        logger_opt.trace(f"        Querry <light-blue><italic>{repr(inst.QUERY_CMD)}</italic></light-blue> sent to <light-blue><italic>{device.name}</italic></light-blue>")
+    resp = _read_with_deadline(device, terminator=b'\n', n_bytes=100, expected=re.escape(inst.QUERY_E_RESP), timeout=resp_timeout).decode("ascii").strip('\n\r')
+    if bsl_log.trace_enabled:
+        logger_opt.trace(f"        Response from <light-blue><italic>{device.name}</italic></light-blue>: {repr(resp)}")
+    return resp
+
+
+def _read_device_sn(inst:bsl_inst_info_class, device:serial.Serial, resp_timeout:float, ident_resp:str=None) -> str:
+    # S/N of `inst` on an open port, or None if it cannot be extracted. Shared by probing and
+    # cache verification, so the S/N stored in the cache is the one verified on the next connect.
+    # Instruments without QUERY_SN_CMD report their S/N in the identification response.
+    if inst.QUERY_SN_CMD == "":
+        resp = _identify_device(inst, device, resp_timeout) if ident_resp is None else ident_resp
+        if inst.QUERY_E_RESP not in resp:
+            return None
+    else:
+        device.reset_input_buffer()
+        device.write(bytes(inst.QUERY_SN_CMD,'ascii'))
+        if bsl_log.trace_enabled:
+            logger_opt.trace(f"        Querry <light-blue><italic>{repr(inst.QUERY_SN_CMD)}</italic></light-blue> sent to <light-blue><italic>{device.name}</italic></light-blue>")
+        resp = (_read_with_deadline(device, terminator=b'\n', n_bytes=100, timeout=resp_timeout).decode("ascii")).strip('\n\r')
+        if bsl_log.trace_enabled:
+            logger_opt.trace(f"        Response from <light-blue><italic>{device.name}</italic></light-blue>: {resp}")
+    # Use provided regular expression to extract device S/N number
+    device_id = re.search(inst.SN_REG, resp)
+    if device_id is None:
+        return None
+    return device_id.group(0).strip('\r\n')
+
+
+def _check_device_resp(inst:bsl_inst_info_class, temp_port:str, target_device_sn:str="", cancel_event:threading.Event=None, deadline:float=None, resp_timeout:float=0.2) -> tuple:
+    # Probe one serial port for `inst` through every candidate baudrate.
+    # Returns (port, baudrate, S/N) on a confirmed model + S/N match, otherwise (None, None, None).
+
+    # Set baudrate to common baudrates if not provided
+    if inst.BAUDRATE != 0:
+        baudrates = list([inst.BAUDRATE])
+    else:
+        baudrates = list([4800,9600,19200,28800,38400,115200])
+
+    # Try to communicate with the device with each possible baudrate
+    try:
+        for baudrate in baudrates:
+            # Abort if another probe already found the device or deadline passed.
+            if (cancel_event is not None and cancel_event.is_set()) or (deadline is not None and time.monotonic() > deadline):
+                return None,None,None
+            logger_opt.debug(f"    Inquiring serial port <light-blue><italic>{temp_port}</italic></light-blue> with Baudrate={baudrate}")
+            # Try to open the serial port
+            with serial.Serial(temp_port, baudrate, timeout=0.1) as device:
+                if bsl_log.trace_enabled:
+                    logger_opt.trace(f"        Connected to <light-blue><italic>{device.name}</italic></light-blue> on port <light-blue><italic>{temp_port}</italic></light-blue>")
+                # Query the device with QUERY_CMD
+                resp = _identify_device(inst, device, resp_timeout)
+                # Check if the response contains expected string and s/n number, if true, port found.
+                if inst.QUERY_E_RESP in resp:
+                    logger_opt.info(f"        <light-blue><italic>{inst.MODEL}</italic></light-blue> found on serial bus on port <light-blue><italic>{temp_port}</italic></light-blue>.")
+                    # Check S/N to confirm matching
+                    device_id = _read_device_sn(inst, device, resp_timeout, ident_resp=resp)
+                    device.close()
+                    # Return device_port, current baudrate and S/N if a positive match is confirmed
+                    if device_id is not None and target_device_sn in device_id:
+                        return (temp_port, baudrate, device_id)
+                    # Able to confirm device model number, but mismatch S/N number
+                    logger_opt.warning(f"    S/N Mismatch - Device <light-blue><italic>{temp_port}</italic></light-blue> with S/N <light-blue><italic>{device_id} found, not {target_device_sn} as requested, moving to next available device...")
+                    break
+                device.close()
+    except serial.SerialException:
+        logger_opt.warning(f"    BUSY - Device <light-blue><italic>{temp_port}</italic></light-blue> is busy, moving to next available device...")
+        return None,None,None
+    return None,None,None
+
+
+def _no_response(resp:str) -> bool:
+    return resp == ""
+
+
+def _missing_response(resps:list[str]) -> bool:
+    return "" in resps
+
 
 @logger_opt.catch
 class bsl_serial:
-    def __init__(self, target_inst:bsl_inst_info_list , device_sn:str="") -> None:
+    # Upper bound of ports probed at the same time, and overall probing deadline.
+    PROBE_MAX_WORKERS = 8
+    PROBE_DEADLINE_S = 10.0
+    # Per-response deadline while probing, and default deadline of regular reads.
+    PROBE_RESP_TIMEOUT_S = 0.2
+    READ_TIMEOUT_S = 1.0
+    # Initial size of the reusable receive buffer of the bytes-level API.
+    RX_BUFFER_SIZE = 4096
+    # Poll period of the background reader thread, and number of unsolicited lines kept.
+    READER_POLL_S = 0.05
+    UNSOLICITED_LINES_MAX = 100
+
+    def __init__(self, target_inst:bsl_inst_info_list , device_sn:str="", *, use_cache:bool=True, handle:bsl_inst_handle=None) -> None:
         logger_opt.info("    Initiating bsl_serial_service...")
         self.device_id=""
         self.inst = target_inst
         self.target_device_sn = device_sn
+        self.use_cache = use_cache
+        self.handle = handle
+        self._rx_buffer = bytearray(self.RX_BUFFER_SIZE)
+        self._reader_thread = None
+        self._reader_stop = threading.Event()
+        self._rx_lines = queue.Queue()
+        self.unsolicited_lines = collections.deque(maxlen=self.UNSOLICITED_LINES_MAX)
+        self._async_pending = bytearray()
+        self._async_lock = None
+        # Retry policy of all command paths, overridden by the instrument drivers.
+        self.retry_policy = DEFAULT_RETRY_POLICY
         self.serial_port = self._connect_serial_device()
         if self.serial_port is None:
             logger_opt.error(f"<light-blue><italic>{self.inst.MODEL} ({self.target_device_sn})</italic></light-blue> not found on serial ports.")
@@ -26,129 +232,553 @@ class bsl_serial:
         return None
 
     def _connect_serial_device(self) -> serial.Serial:
-        if self._find_device():
+        # Use the port identified by discover_all if provided, otherwise try the
+        # last known port first, and only sweep the whole bus if verification fails.
+        if self._use_handle() or self._find_cached_device() or self._find_device():
             logger_opt.success(f"    {self.inst.MODEL} with DEVICE_ID: <light-blue><italic>{self.device_id}</italic></light-blue> found and connected!")
+            if self.use_cache:
+                self._store_cached_device()
             return serial.Serial(self.serial_port_name, self.baudrate)
         return None
 
+    def _use_handle(self) -> bool:
+        if self.handle is None or self.handle.port is None:
+            return False
+        if self.handle.inst.MODEL != self.inst.MODEL or self.target_device_sn not in self.handle.device_id:
+            logger_opt.warning(f"    Provided handle {repr(self.handle)} does not match <light-blue><italic>{self.inst.MODEL} ({self.target_device_sn})</italic></light-blue>, ignored.")
+            return False
+        self.baudrate = self.handle.baudrate
+        self.serial_port_name = self.handle.port
+        self.device_id = self.handle.device_id
+        return True
+
+    def _find_cached_device(self) -> bool:
+        if not self.use_cache:
+            return False
+        for entry in discovery_cache.lookup(self.inst, self.target_device_sn):
+            port_name = entry["port"]
+            # USB-serial adaptors may be re-enumerated under a new port name, follow the USB serial string.
+            if entry["usb_serial"] is not None:
+                for port in comports():
+                    if port.serial_number == entry["usb_serial"]:
+                        port_name = port.device
+                        break
+            if port_name is None or entry["baudrate"] is None:
+                continue
+            logger_opt.debug(f"    Verifying cached port <light-blue><italic>{port_name}</italic></light-blue> for <light-blue><italic>{self.inst.MODEL} ({entry['device_sn']})</italic></light-blue>...")
+            try:
+                device_id = self._verify_device_sn(port_name, entry["baudrate"])
+            except serial.SerialException:
+                # A briefly busy or vanished port says nothing about the cached device, keep its entry.
+                logger_opt.debug(f"    Cached port <light-blue><italic>{port_name}</italic></light-blue> could not be opened, keeping cache entry.")
+                continue
+            if device_id is not None and device_id == entry["device_sn"]:
+                self.baudrate = entry["baudrate"]
+                self.serial_port_name = port_name
+                self.device_id = device_id
+                return True
+            logger_opt.debug(f"    Cached port <light-blue><italic>{port_name}</italic></light-blue> failed verification, dropping cache entry.")
+            discovery_cache.invalidate(self.inst, entry["device_sn"])
+        return False
+
+    def _verify_device_sn(self, temp_port:str, baudrate:int) -> str:
+        # Single S/N query round trip on a known port, through the same path as probing, return the S/N or None.
+        # Raises `serial.SerialException` if the port cannot be opened.
+        try:
+            with serial.Serial(temp_port, baudrate, timeout=0.1) as device:
+                device_id = _read_device_sn(self.inst, device, self.PROBE_RESP_TIMEOUT_S)
+        except UnicodeDecodeError:
+            return None
+        if device_id is None or self.target_device_sn not in device_id:
+            return None
+        return device_id
+
+    def _store_cached_device(self) -> None:
+        usb_serial = None
+        for port in comports():
+            if port.device == self.serial_port_name:
+                usb_serial = port.serial_number
+                break
+        discovery_cache.store(self.inst, self.device_id, port=self.serial_port_name, baudrate=self.baudrate, usb_serial=usb_serial)
+        pass
+
     def _find_device(self) -> serial.tools.list_ports_common.ListPortInfo:
     # Find first available target device by searching Serial COM ports.
     # Return serial port object.
 
+        # One overall probing deadline shared by both passes.
+        deadline = time.monotonic() + self.PROBE_DEADLINE_S
         #Aquire all available Serial COM ports.
         com_ports_list = list(comports())
-        target_port = None
-        logger_opt.trace(f"    Devices found on bus:{str([port_name[0] for port_name in comports()])}")
+        if bsl_log.trace_enabled:
+            logger_opt.trace(f"    Devices found on bus:{str([port_name[0] for port_name in com_ports_list])}")
         #Search for target device with the name of the USB device.
+        candidate_ports = list()
         for port in com_ports_list:
-            temp_port = None
-            
             if self.inst.SERIAL_NAME in port[1]:
                 logger_opt.debug(f"    Specified device <light-blue><italic>{self.inst.MODEL}</italic></light-blue> with Serial_Name <light-blue><italic>{self.inst.SERIAL_NAME}</italic></light-blue> found on port <light-blue><italic>{port[0]}</italic></light-blue> by Device name search.")
-                temp_port = port[0]
+                candidate_ports.append(port[0])
+                continue
             
             if (self.inst.USB_PID in port[2]) or (str(int(self.inst.USB_PID,16)) in port[2]):
                 logger_opt.debug(f"    Specified device <light-blue><italic>{self.inst.MODEL}</italic></light-blue> with USB_PID: <light-blue><italic>{self.inst.USB_PID}</italic></light-blue> found on port <light-blue><italic>{port[0]}</italic></light-blue> by USB_PID search.")
-                temp_port = port[0]
-            
-            if temp_port is not None:
-                (temp_port, baudrate) = self._check_device_resp(temp_port)
-                if temp_port is not None:
-                    self.baudrate = baudrate
-                    self.serial_port_name = temp_port
-                    return True
-                continue
+                candidate_ports.append(port[0])
+        
+        if self._probe_ports(candidate_ports, deadline):
+            return True
         
         logger.warning(f"    No device found based on USB_PID/VID or Serial Name search!")
         
         # Failed to find device with either USB_PID or device name
-        # Now try to foreach every signle serial device
-        for port in com_ports_list:
-            temp_port = None
-            (temp_port, baudrate) = self._check_device_resp(port[0])
-            if temp_port is not None:
-                self.baudrate = baudrate
-                self.serial_port_name = temp_port
-                return True
+        # Now try every remaining serial device on the bus
+        remaining_ports = [port[0] for port in com_ports_list if port[0] not in candidate_ports]
+        if self._probe_ports(remaining_ports, deadline):
+            return True
         return None
-                
-    def _check_device_resp(self, temp_port) -> serial.Serial:
-        # Set baudrate to common baudrates if not provided
-        if self.inst.BAUDRATE != 0:
-            baudrates = list([self.inst.BAUDRATE])
-        else:
-            baudrates = list([4800,9600,19200,28800,38400,115200])
-
-        # Try to communicate with the device with each possible baudrate
+
+    def _probe_ports(self, ports:list[str], deadline:float) -> bool:
+        # Probe the provided ports concurrently with a bounded worker pool until `deadline`,
+        # first confirmed match (model + S/N) wins and cancels the others.
+        if len(ports) == 0 or time.monotonic() >= deadline:
+            return False
+
+        cancel_event = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=min(self.PROBE_MAX_WORKERS, len(ports)), thread_name_prefix=f"bsl_serial_probe_{self.inst.MODEL}")
+        futures = [executor.submit(self._check_device_resp, port, cancel_event, deadline) for port in ports]
         try:
-            for baudrate in baudrates:
-                logger_opt.debug(f"    Inquiring serial port <light-blue><italic>{temp_port}</italic></light-blue> with Baudrate={baudrate}")
-                # Try to open the serial port
-                with serial.Serial(temp_port, baudrate, timeout=0.1) as device:
-                    logger_opt.trace(f"        Connected to <light-blue><italic>{device.name}</italic></light-blue> on port <light-blue><italic>{temp_port}</italic></light-blue>")
-                    # Query the device with QUERY_CMD
-                    device.reset_input_buffer()
-                    device.write(bytes(self.inst.QUERY_CMD,'ascii'))
-                    logger_opt.trace(f"        Querry <light-blue><italic>{repr(self.inst.QUERY_CMD)}</italic></light-blue> sent to <light-blue><italic>{device.name}</italic></light-blue>")
-                    time.sleep(0.1)
-                    resp = repr(device.read(100).decode("ascii")).strip('\n\r')
-                    logger_opt.trace(f"        Response from <light-blue><italic>{device.name}</italic></light-blue>: {resp}")
-                    # Check if the response contains expected string and s/n number, if true, port found.
-                    if self.inst.QUERY_E_RESP in resp:
-                        logger_opt.info(f"        <light-blue><italic>{self.inst.MODEL}</italic></light-blue> found on serial bus on port <light-blue><italic>{temp_port}</italic></light-blue>.")
-                        # Check S/N to confirm matching
-                        device.reset_input_buffer()
-                        device.write(bytes(self.inst.QUERY_SN_CMD,'ascii'))
-                        logger_opt.trace(f"        Querry <light-blue><italic>{repr(self.inst.QUERY_SN_CMD)}</italic></light-blue> sent to <light-blue><italic>{device.name}</italic></light-blue>")
-                        time.sleep(0.1)
-                        resp = (device.read(100).decode("ascii")).strip('\n\r')
-                        logger_opt.trace(f"        Response from <light-blue><italic>{device.name}</italic></light-blue>: {resp}")
-                        # Use provided regular expression to extract device S/N number
-                        device_id = re.search(self.inst.SN_REG, resp).group(0)
-                        device.close()
-                        # Return device_port and current baudrate if a positive match is confirmed
-                        if self.target_device_sn in device_id:
-                            self.device_id = device_id.strip('\r\n')
-                            return (temp_port, baudrate) 
-                        # Able to confirm device model number, but mismatch S/N number
-                        logger_opt.warning(f"    S/N Mismatch - Device <light-blue><italic>{temp_port}</italic></light-blue> with S/N <light-blue><italic>{device_id} found, not {self.target_device_sn} as requested, moving to next available device...")
-                        break
-                    device.close()
-        except serial.SerialException:
-            logger_opt.warning(f"    BUSY - Device <light-blue><italic>{temp_port}</italic></light-blue> is busy, moving to next available device...")
-            return None,None
-        return None,None
-
-    def readline(self) -> str:
-        resp = self.serial_port.readline().decode("ascii")
-        logger_opt.trace(f"        {self.inst.MODEL} - com-Serial - Resp from {self.inst.MODEL} with {repr(resp)}")
+            for future in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+                try:
+                    (temp_port, baudrate, device_id) = future.result()
+                except Exception as e:
+                    logger_opt.warning(f"    Probe failed with {type(e)}, moving to next available device...")
+                    continue
+                if temp_port is not None:
+                    cancel_event.set()
+                    self.baudrate = baudrate
+                    self.serial_port_name = temp_port
+                    self.device_id = device_id
+                    return True
+        except FutureTimeoutError:
+            logger_opt.warning(f"    TIMEOUT - Port probing exceeded the {self.PROBE_DEADLINE_S:.1f}s deadline, remaining probes cancelled.")
+        finally:
+            # Stop in-flight probes between baudrates and drop the queued ones.
+            cancel_event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+        return False
+                
+    def _check_device_resp(self, temp_port, cancel_event:threading.Event=None, deadline:float=None) -> tuple:
+        return _check_device_resp(self.inst, temp_port, self.target_device_sn, cancel_event, deadline, self.PROBE_RESP_TIMEOUT_S)
+
+    def readline(self, timeout:float=None) -> str:
+        """
+        - Read one line from the device, returns as soon as `\\n` arrives.
+
+        Parameters
+        ----------
+        timeout : `float`
+            (default to `READ_TIMEOUT_S`)
+            Deadline of the read in seconds, partial line is returned on timeout.
+        """
+        if self._reader_thread is not None:
+            return self._pop_line(timeout)
+        return self.read_response(terminator="\n", timeout=timeout)
+
+    def read_response(self, *, terminator:str=None, n_bytes:int=None, expected:str=None, timeout:float=None) -> str:
+        """
+        - Read a response from the device, returns as soon as the terminator,
+        `n_bytes` bytes, or a match of the `expected` regular expression
+        arrives, whichever comes first.
+
+        - After an `expected` match, the rest of the line is still consumed,
+        up to the terminator or until the device goes idle, and returned.
+
+        Parameters
+        ----------
+        terminator : `str`
+            (default to None)
+            End-of-response marker, e.g. `"\\n"`.
+        n_bytes : `int`
+            (default to None)
+            Maximum number of bytes of the response.
+        expected : `str`
+            (default to None)
+            Regular expression expected in the response, e.g. `QUERY_E_RESP`.
+        timeout : `float`
+            (default to `READ_TIMEOUT_S`)
+            Deadline of the read in seconds, partial response is returned on timeout.
+
+        Returns
+        --------
+        resp : `str`
+            Response stripped from leading/trailing `\\n\\r`.
+        """
+        self._check_no_reader()
+        if timeout is None:
+            timeout = self.READ_TIMEOUT_S
+        if terminator is not None:
+            terminator = bytes(terminator, 'ascii')
+        resp = _read_with_deadline(self.serial_port, terminator=terminator, n_bytes=n_bytes, expected=expected, timeout=timeout).decode("ascii")
+        if bsl_log.trace_enabled:
+            logger_opt.trace(f"        {self.inst.MODEL} - com-Serial - Resp from {self.inst.MODEL} with {repr(resp)}")
         return resp.strip('\n\r')
     
     def read(self, n_bytes:int) -> str:
+        self._check_no_reader()
         resp = self.serial_port.read(n_bytes).decode("ascii")
-        logger_opt.trace(f"        {self.inst.MODEL} - com-Serial - Resp from {self.inst.MODEL} with {repr(resp)}")
+        if bsl_log.trace_enabled:
+            logger_opt.trace(f"        {self.inst.MODEL} - com-Serial - Resp from {self.inst.MODEL} with {repr(resp)}")
         return resp.strip('\n\r')
 
     def write(self, msg:str) -> int:
-        logger_opt.trace(f"        {self.inst.MODEL} - com-Serial - Write to {self.inst.MODEL} with {repr(msg)}")
+        return self.retry_policy.call(self._write_once, msg, description=lambda: f"{self.inst.MODEL} write {repr(msg)}")
+
+    def _write_once(self, msg:str) -> int:
+        if bsl_log.trace_enabled:
+            logger_opt.trace(f"        {self.inst.MODEL} - com-Serial - Write to {self.inst.MODEL} with {repr(msg)}")
         return self.serial_port.write(bytes(msg, 'ascii'))
     
     def writeline(self, msg:str) -> int:
-        msg = msg +'\r\n'
-        logger_opt.trace(f"        {self.inst.MODEL} - com-Serial - Write to {self.inst.MODEL} with {repr(msg)}")
-        return self.serial_port.write(bytes(msg, 'ascii'))
+        return self.write(msg + '\r\n')
+
+    def query(self, cmd:str, timeout:float=None) -> str:
+        """
+        - Send `cmd` and read one response line, the query is sent again
+        according to `retry_policy` when no response arrives in time.
+        """
+        return self.retry_policy.call(self._query_once, cmd, timeout, description=lambda: f"{self.inst.MODEL} query {repr(cmd)}", retry_if=_no_response)
 
-    def query(self, cmd:str) -> str:
+    def _query_once(self, cmd:str, timeout:float=None) -> str:
+        # The write is not retried on its own, the whole query is.
+        self.flush_read_buffer()
+        self._write_once(cmd + '\r\n')
+        return self.readline(timeout)
+
+    def query_multiline(self, cmd:str, *, end:str=None, idle_timeout:float=None, timeout:float=None, skip_leading_empty:bool=False) -> list[str]:
+        """
+        - Send `cmd` and collect a multi-line response, ending on a line
+        matching `end`, on an empty line, or when no further line arrives
+        within `idle_timeout` after the previous one.
+
+        Parameters
+        ----------
+        cmd : `str`
+            Command to be sent.
+        end : `str`
+            (default to None)
+            Regular expression of the terminating line, which is not returned.
+        idle_timeout : `float`
+            (default to None)
+            Maximum gap in seconds between two lines of the same response.
+        timeout : `float`
+            (default to `READ_TIMEOUT_S`)
+            Deadline of the whole response in seconds.
+        skip_leading_empty : `bool`
+            (default to False)
+            Skip one empty line before the first response line, for
+            devices starting every reply with a bare line break.
+
+        Returns
+        --------
+        lines : `list[str]`
+            Response lines in order.
+        """
+        deadline = time.monotonic() + (self.READ_TIMEOUT_S if timeout is None else timeout)
+        end = re.compile(end) if end is not None else None
         self.flush_read_buffer()
         self.writeline(cmd)
-        return self.readline()
+        lines = list()
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if idle_timeout is not None and len(lines) > 0:
+                remaining = min(remaining, idle_timeout)
+            line = self.readline(remaining)
+            if skip_leading_empty:
+                skip_leading_empty = False
+                if line == "":
+                    continue
+            if line == "" or (end is not None and end.fullmatch(line) is not None):
+                break
+            lines.append(line)
+        return lines
+
+    def query_batch(self, cmds:list[str], timeout:float=None) -> list[str]:
+        """
+        - Send all `cmds` back to back in a single write, then read back
+        one response line per command, in order.
+
+        Parameters
+        ----------
+        cmds : `list[str]`
+            Commands to be sent, line termination is appended to each.
+        timeout : `float`
+            (default to `READ_TIMEOUT_S`)
+            Deadline of each response line in seconds.
+
+        Returns
+        --------
+        resps : `list[str]`
+            Responses in the same order as `cmds`.
+        """
+        return self.retry_policy.call(self._query_batch_once, cmds, timeout, description=lambda: f"{self.inst.MODEL} batched query", retry_if=_missing_response)
+
+    def _query_batch_once(self, cmds:list[str], timeout:float=None) -> list[str]:
+        self.flush_read_buffer()
+        self._write_once("".join(cmd + '\r\n' for cmd in cmds))
+        return [self.readline(timeout) for _ in cmds]
+
+    def _check_no_reader(self) -> None:
+        if self._reader_thread is not None:
+            logger_opt.error(f"    {self.inst.MODEL} - com-Serial - Raw reads are not available while the background reader runs!")
+            raise bsl_type.DeviceOperationError
+        pass
+
+    def _reserve_rx_buffer(self, n_bytes:int) -> bytearray:
+        # Grow the reusable receive buffer if needed.
+        if len(self._rx_buffer) < n_bytes:
+            self._rx_buffer = bytearray(n_bytes)
+        return self._rx_buffer
+
+    def read_exact(self, n_bytes:int, timeout:float=None) -> memoryview:
+        """
+        - Read exactly `n_bytes` raw bytes from the device, no decoding or stripping.
+
+        - The returned view refers to an internal reusable buffer and is only
+        valid until the next bytes-level read, use `bytes()` to keep a copy.
+
+        Parameters
+        ----------
+        n_bytes : `int`
+            Number of bytes to be read.
+        timeout : `float`
+            (default to `READ_TIMEOUT_S`)
+            Deadline of the read in seconds.
+
+        Returns
+        --------
+        data : `memoryview`
+            Received bytes.
+
+        Raises
+        --------
+        Short read : `bsl_type.DeviceOperationError`
+            Less than `n_bytes` bytes arrived before the deadline.
+        """
+        self._check_no_reader()
+        buffer = self._reserve_rx_buffer(n_bytes)
+        count = _readinto_with_deadline(self.serial_port, buffer, n_bytes, timeout=self.READ_TIMEOUT_S if timeout is None else timeout)
+        if bsl_log.trace_enabled:
+            logger_opt.trace(f"        {self.inst.MODEL} - com-Serial - Resp from {self.inst.MODEL} with {count} bytes")
+        if count != n_bytes:
+            logger_opt.error(f"    {self.inst.MODEL} - com-Serial - Short read, {count} of {n_bytes} bytes received before timeout.")
+            raise bsl_type.DeviceOperationError
+        return memoryview(buffer)[:count]
+
+    def read_until(self, terminator:bytes=b'\n', max_bytes:int=None, timeout:float=None) -> memoryview:
+        """
+        - Read raw bytes from the device until `terminator` (included) arrives,
+        no decoding or stripping.
+
+        - The returned view refers to an internal reusable buffer and is only
+        valid until the next bytes-level read, use `bytes()` to keep a copy.
+
+        Parameters
+        ----------
+        terminator : `bytes`
+            (default to `b"\\n"`)
+            End-of-response marker.
+        max_bytes : `int`
+            (default to `RX_BUFFER_SIZE`)
+            Maximum number of bytes to be read.
+        timeout : `float`
+            (default to `READ_TIMEOUT_S`)
+            Deadline of the read in seconds, partial data is returned on timeout.
+
+        Returns
+        --------
+        data : `memoryview`
+            Received bytes.
+        """
+        self._check_no_reader()
+        max_bytes = self.RX_BUFFER_SIZE if max_bytes is None else max_bytes
+        buffer = self._reserve_rx_buffer(max_bytes)
+        count = _readinto_with_deadline(self.serial_port, buffer, max_bytes, terminator=terminator, timeout=self.READ_TIMEOUT_S if timeout is None else timeout)
+        if bsl_log.trace_enabled:
+            logger_opt.trace(f"        {self.inst.MODEL} - com-Serial - Resp from {self.inst.MODEL} with {count} bytes")
+        return memoryview(buffer)[:count]
+
+    def write_bytes(self, data:bytes) -> int:
+        """
+        - Write raw bytes to the device, no encoding or line termination.
+        """
+        if bsl_log.trace_enabled:
+            logger_opt.trace(f"        {self.inst.MODEL} - com-Serial - Write to {self.inst.MODEL} with {len(data)} bytes")
+        return self.serial_port.write(data)
+
+    def query_bytes(self, cmd:bytes, *, n_bytes:int=None, terminator:bytes=b'\n', timeout:float=None) -> memoryview:
+        """
+        - Send raw `cmd` and read back a raw response, either exactly `n_bytes`
+        bytes, or up to and including `terminator` if `n_bytes` is not given.
+
+        - The returned view refers to an internal reusable buffer and is only
+        valid until the next bytes-level read, use `bytes()` to keep a copy.
+        """
+        self.flush_read_buffer()
+        self.write_bytes(cmd)
+        if n_bytes is not None:
+            return self.read_exact(n_bytes, timeout)
+        return self.read_until(terminator, timeout=timeout)
         
     def flush_read_buffer(self) -> None:
+        if self._reader_thread is not None:
+            # Keep lines nobody asked for instead of dropping them.
+            while True:
+                try:
+                    (timestamp, line) = self._rx_lines.get_nowait()
+                except queue.Empty:
+                    break
+                logger_opt.debug(f"    {self.inst.MODEL} - com-Serial - Unsolicited line: {repr(line)}")
+                self.unsolicited_lines.append((timestamp, line))
+            return None
+        self._async_pending.clear()
+        self.serial_port.reset_input_buffer()
+        pass
+
+    async def readline_async(self, timeout:float=None) -> str:
+        """
+        - Async counterpart of `readline`. On POSIX the port's file descriptor
+        is watched by the event loop directly, elsewhere the blocking read
+        is offloaded to the default executor.
+        """
+        timeout = self.READ_TIMEOUT_S if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        if self._reader_thread is not None:
+            return await loop.run_in_executor(None, self._pop_line, timeout)
+        try:
+            fd = self.serial_port.fileno()
+        except (AttributeError, io.UnsupportedOperation):
+            return await loop.run_in_executor(None, self.readline, timeout)
+
+        line_ready = loop.create_future()
+        def _on_readable() -> None:
+            n_bytes = self.serial_port.in_waiting
+            if n_bytes > 0:
+                self._async_pending += self.serial_port.read(n_bytes)
+            if b'\n' in self._async_pending and not line_ready.done():
+                line_ready.set_result(None)
+
+        # A complete line may already be left over from a previous read.
+        if b'\n' not in self._async_pending:
+            try:
+                loop.add_reader(fd, _on_readable)
+            except NotImplementedError:
+                return await loop.run_in_executor(None, self.readline, timeout)
+            try:
+                await asyncio.wait_for(line_ready, timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                loop.remove_reader(fd)
+
+        # Bytes past the first line stay pending for the next async read.
+        end = self._async_pending.find(b'\n')
+        end = len(self._async_pending) if end == -1 else end + 1
+        resp = self._async_pending[:end].decode("ascii", errors="replace")
+        del self._async_pending[:end]
+        if bsl_log.trace_enabled:
+            logger_opt.trace(f"        {self.inst.MODEL} - com-Serial - Resp from {self.inst.MODEL} with {repr(resp)}")
+        return resp.strip('\n\r')
+
+    async def write_async(self, msg:str) -> int:
+        """
+        - Async counterpart of `write`, the write and its retries run in
+        the default executor so the event loop is never blocked.
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, self.write, msg)
+
+    async def writeline_async(self, msg:str) -> int:
+        """
+        - Async counterpart of `writeline`.
+        """
+        return await self.write_async(msg + '\r\n')
+
+    async def query_async(self, cmd:str, timeout:float=None) -> str:
+        """
+        - Async counterpart of `query`, concurrent queries on the same
+        instrument are serialized so responses are never interleaved.
+        """
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            self.flush_read_buffer()
+            await self.writeline_async(cmd)
+            return await self.readline_async(timeout)
+
+    def start_reader(self) -> None:
+        """
+        - Start a background reader thread that frames incoming lines into
+        a queue. While it runs, `readline`/`query` are served from the queue,
+        and lines arriving outside of a request are kept in `unsolicited_lines`.
+
+        - Raw bytes-level reads are not available while the reader runs.
+        """
+        if self._reader_thread is not None:
+            return None
         self.serial_port.reset_input_buffer()
+        self._reader_stop.clear()
+        self._reader_thread = threading.Thread(target=self._reader_loop, name=f"bsl_serial_reader_{self.inst.MODEL}", daemon=True)
+        self._reader_thread.start()
+        pass
+
+    def stop_reader(self) -> None:
+        """
+        - Stop the background reader thread, pending lines are kept as unsolicited.
+        """
+        if self._reader_thread is None:
+            return None
+        self._reader_stop.set()
+        self._reader_thread.join()
+        self.flush_read_buffer()
+        self._reader_thread = None
+        pass
+
+    def _reader_loop(self) -> None:
+        pending = bytearray()
+        while not self._reader_stop.is_set():
+            try:
+                pending += _read_with_deadline(self.serial_port, terminator=b'\n', timeout=self.READER_POLL_S)
+            except serial.SerialException as e:
+                logger_opt.error(f"    {self.inst.MODEL} - com-Serial - Reader thread stopped: {e}")
+                break
+            if pending.endswith(b'\n'):
+                line = pending.decode("ascii", errors="replace").strip('\n\r')
+                if bsl_log.trace_enabled:
+                    logger_opt.trace(f"        {self.inst.MODEL} - com-Serial - Resp from {self.inst.MODEL} with {repr(line)}")
+                self._rx_lines.put((time.monotonic(), line))
+                pending.clear()
         pass
 
+    def _pop_line(self, timeout:float=None) -> str:
+        # Await the next framed line from the reader thread, "" on timeout like a timed-out readline.
+        try:
+            (_, line) = self._rx_lines.get(timeout=self.READ_TIMEOUT_S if timeout is None else timeout)
+        except queue.Empty:
+            return ""
+        return line
+
     def close(self) -> None:
+        if self._reader_thread is not None:
+            self.stop_reader()
         if self.serial_port is not None:
             self.serial_port.close()
         pass
-        
\ No newline at end of file
+
+
+async def connect_async(target_inst:bsl_inst_info_list, device_sn:str="", **kwargs) -> "bsl_serial":
+    """
+    - Async counterpart of `bsl_serial(target_inst, device_sn)`, discovery
+    runs in the default executor so the event loop is never blocked.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(bsl_serial, target_inst, device_sn, **kwargs))
@@ -1,23 +1,113 @@
 from loguru import logger
 from .._bsl_inst_info import bsl_inst_info_list
 from .._bsl_type import bsl_type
+from .._bsl_log import bsl_log
+from .._bsl_inst_cache import discovery_cache
+from .._bsl_inst_handle import bsl_inst_handle
+from .._bsl_retry import DEFAULT_RETRY_POLICY
 import re
+import time
+import asyncio
+import functools
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 try:
     import pyvisa as pyvisa
 except ImportError:
     pass
 logger_opt = logger.opt(ansi=True)
 
+# USB VISA resources: USB[board]::<VID>::<PID>::<S/N>::..., with hex or decimal IDs.
+_VISA_USB_REG = re.compile(r"^USB\d*::(0x[0-9A-Fa-f]+|\d+)::(0x[0-9A-Fa-f]+|\d+)::")
+
+# Process-wide ResourceManager and resource listing shared by all bsl_visa instances.
+RESOURCE_LIST_TTL_S = 2.0
+_resource_manager = None
+_resource_list = None
+_resource_list_time = 0.0
+_resource_lock = threading.Lock()
+
+
+def get_resource_manager():
+    """
+    - Return the process-wide shared `pyvisa.ResourceManager`, created on first use.
+    """
+    global _resource_manager
+    with _resource_lock:
+        if _resource_manager is None:
+            _resource_manager = pyvisa.ResourceManager()
+        return _resource_manager
+
+
+def list_resources(max_age:float=None) -> tuple:
+    """
+    - Return the VISA resource listing, served from cache when younger
+    than `max_age` seconds (default to `RESOURCE_LIST_TTL_S`).
+    """
+    global _resource_list, _resource_list_time
+    resource_manager = get_resource_manager()
+    max_age = RESOURCE_LIST_TTL_S if max_age is None else max_age
+    with _resource_lock:
+        if _resource_list is None or time.monotonic() - _resource_list_time > max_age:
+            _resource_list = tuple(resource_manager.list_resources())
+            _resource_list_time = time.monotonic()
+        return _resource_list
+
+
+def invalidate_resource_list() -> None:
+    """
+    - Drop the cached VISA resource listing, e.g. after plugging in an instrument.
+    """
+    global _resource_list
+    with _resource_lock:
+        _resource_list = None
+    pass
+
+
+def list_opened_resources() -> set[str]:
+    """
+    - Return the names of the resources currently opened on the shared ResourceManager.
+    """
+    return {resource.resource_name for resource in get_resource_manager().list_opened_resources()}
+
+
+def _usb_id(vid, pid) -> tuple:
+    # Normalize a (VID, PID) pair given as hex/decimal strings or ints, None if unknown.
+    try:
+        return (int(vid, 0) if isinstance(vid, str) else int(vid), int(pid, 0) if isinstance(pid, str) else int(pid))
+    except (TypeError, ValueError):
+        return None
+
+
+def _visa_usb_id(resource:str) -> tuple:
+    # Normalized (VID, PID) of a USB VISA resource string, None for other resources.
+    match = _VISA_USB_REG.match(resource)
+    if match is None:
+        return None
+    return _usb_id(match.group(1), match.group(2))
+
+
 @logger_opt.catch
 class bsl_visa:
+    # Upper bound of candidate resources probed at the same time.
+    PROBE_MAX_WORKERS = 8
 
-    def __init__(self, target_inst:bsl_inst_info_list, device_sn:str="") -> None:
+    def __init__(self, target_inst:bsl_inst_info_list, device_sn:str="", *, use_cache:bool=True, handle:bsl_inst_handle=None) -> None:
         #Init logger_opt by inherit from parent process or using a new one if no parent logger_opt
         logger_opt.info("    Initiating bsl_visa_service...")
-        self.visa_resource_manager = pyvisa.ResourceManager()
+        self.visa_resource_manager = get_resource_manager()
 
         self.inst = target_inst
         self.target_device_sn = device_sn
+        self.use_cache = use_cache
+        self.handle = handle
+        self._usb_id = _usb_id(self.inst.USB_VID, self.inst.USB_PID)
+        self._async_lock = None
+        # Retry policy of all command paths, overridden by the instrument drivers.
+        self.retry_policy = DEFAULT_RETRY_POLICY
+        # Serializes session access between foreground calls and background acquisition threads.
+        self.lock = threading.RLock()
         self._connect_visa_device()
         if self.com_port is None:
             logger_opt.error(f"<light-blue><italic>{self.inst.MODEL} ({self.target_device_sn})</italic></light-blue> not found on VISA/SCPI ports.")
@@ -26,69 +116,249 @@ class bsl_visa:
     def __del__(self) -> None:
         self.close()
 
-    def _find_device_vpid(self) -> None:
-        resource_list = self.visa_resource_manager.list_resources()
-        logger.debug(f"    bsl_VISA - Currently opened devices: {repr(self.visa_resource_manager.list_opened_resources())}")
+    def _use_handle(self) -> tuple:
+        # Resource identified by discover_all, the S/N is confirmed again on connection.
+        if self.handle is None or self.handle.visa_resource is None:
+            return None
+        if self.handle.inst.MODEL != self.inst.MODEL or self.target_device_sn not in self.handle.device_id:
+            logger_opt.warning(f"    Provided handle {repr(self.handle)} does not match <light-blue><italic>{self.inst.MODEL} ({self.target_device_sn})</italic></light-blue>, ignored.")
+            return None
+        if self._is_busy(self.handle.visa_resource):
+            return None
+        return self._probe_resource(self.handle.visa_resource, self.inst.QUERY_CMD)
+
+    def _is_busy(self, port:str, opened_resources:set[str]=None) -> bool:
+        # Resources already opened on the shared ResourceManager belong to another instance.
+        if port not in (list_opened_resources() if opened_resources is None else opened_resources):
+            return False
+        logger_opt.warning(f"    BUSY - Device <light-blue><italic>{port}</italic></light-blue> is busy, moving to next available device...")
+        return True
+
+    def _probe_resource(self, port:str, query_cmd:str) -> tuple:
+        # Open `port` and identify it with `query_cmd`. On a model and S/N match the still
+        # open session is returned as (port, session, resp) to become the live connection,
+        # otherwise the session is closed and None is returned.
+        try:
+            temp_com_port = self.visa_resource_manager.open_resource(port)
+        except Exception as e:
+            logger_opt.warning(f"    BUSY - Device <light-blue><italic>{port}</italic></light-blue> failed to open ({type(e)}), moving to next available device...")
+            return None
+        try:
+            resp = temp_com_port.query(query_cmd).strip()
+            device_id = re.search(self.inst.SN_REG, resp)
+        except Exception as e:
+            logger_opt.warning(f"    Device <light-blue><italic>{port}</italic></light-blue> failed to respond ({type(e)}), moving to next available device...")
+            temp_com_port.close()
+            return None
+        if device_id is None or self.target_device_sn not in device_id.group(0):
+            temp_com_port.close()
+            logger_opt.warning(f"    S/N Mismatch - Device <light-blue><italic>{port}</italic></light-blue> with S/N <light-blue><italic>{None if device_id is None else device_id.group(0)}</italic></light-blue> found, not <light-blue><italic>{self.target_device_sn}</italic></light-blue> as requested, moving to next available device...")
+            return None
+        return (port, temp_com_port, resp)
+
+    def _find_cached_device(self) -> tuple:
+        # Verify the last known VISA resource with one S/N query before sweeping the bus.
+        if not self.use_cache:
+            return None
+        for entry in discovery_cache.lookup(self.inst, self.target_device_sn):
+            port = entry["visa_resource"]
+            # A busy resource is in use by another instance, its entry stays valid.
+            if port is None or self._is_busy(port):
+                continue
+            logger_opt.debug(f"    Verifying cached resource <light-blue><italic>{port}</italic></light-blue> for <light-blue><italic>{self.inst.MODEL} ({entry['device_sn']})</italic></light-blue>...")
+            probe = self._probe_resource(port, self.inst.QUERY_SN_CMD)
+            if probe is not None and re.search(self.inst.SN_REG, probe[2]).group(0) == entry["device_sn"]:
+                return probe
+            if probe is not None:
+                probe[1].close()
+            logger_opt.debug(f"    Cached resource <light-blue><italic>{port}</italic></light-blue> failed verification, dropping cache entry.")
+            discovery_cache.invalidate(self.inst, entry["device_sn"])
+        return None
+
+    def _find_device_vpid(self) -> tuple:
+        probe = self._search_resources(list_resources())
+        if probe is None:
+            # The cached listing may predate a newly plugged instrument, rescan once.
+            invalidate_resource_list()
+            probe = self._search_resources(list_resources())
+        return probe
+
+    def _search_resources(self, resource_list:tuple) -> tuple:
+        opened_resources = list_opened_resources()
+        logger.debug(f"    bsl_VISA - Currently opened devices: {repr(opened_resources)}")
+        candidates = list()
         for port in resource_list:
             logger_opt.debug(f"    Found bus device <light-blue><italic>{port}</italic></light-blue>")
-            if port in str(self.visa_resource_manager.list_opened_resources()):
-                logger_opt.warning(f"    BUSY - Device <light-blue><italic>{port}</italic></light-blue> is busy, moving to next available device...")
+            if self._is_busy(port, opened_resources):
                 continue
-            if (self.inst.USB_PID in port) and (self.inst.USB_VID in port):
-                logger_opt.debug(f"    {self.inst.MODEL} is found with USB_PID/VID search.")
-                temp_com_port = self.visa_resource_manager.open_resource(port)
-                device_id = re.search(self.inst.SN_REG, temp_com_port.query(self.inst.QUERY_CMD).strip()).group(0)
-                if self.target_device_sn not in device_id:
-                    temp_com_port.close()
-                    logger_opt.warning(f"    S/N Mismatch - Device <light-blue><italic>{port}</italic></light-blue> with S/N <light-blue><italic>{device_id}</italic></light-blue> found, not <light-blue><italic>{self.target_device_sn}</italic></light-blue> as requested, moving to next available device...")
-                    continue
-                temp_com_port.close()
-                return port
-            if ( str(int(self.inst.USB_PID,16)) in port and str(int(self.inst.USB_VID,16)) in port):
+            if _visa_usb_id(port) == self._usb_id:
                 logger_opt.debug(f"    {self.inst.MODEL} is found with USB_PID/VID search.")
-                temp_com_port = self.visa_resource_manager.open_resource(port)
-                device_id = re.search(self.inst.SN_REG, temp_com_port.query(self.inst.QUERY_CMD).strip()).group(0)
-                if self.target_device_sn not in device_id:
-                    temp_com_port.close()
-                    logger_opt.warning(f"    S/N Mismatch - Device <light-blue><italic>{port}</italic></light-blue> with S/N <light-blue><italic>{device_id}</italic></light-blue> found, not <light-blue><italic>{self.target_device_sn}</italic></light-blue> as requested, moving to next available device...")
-                    continue
-                temp_com_port.close()
-                return port
-        return None
+                candidates.append(port)
+        if len(candidates) == 0:
+            return None
+
+        # Probe all candidates concurrently, keep the first matching session open
+        # and close every other one.
+        with ThreadPoolExecutor(max_workers=min(self.PROBE_MAX_WORKERS, len(candidates)), thread_name_prefix=f"bsl_visa_probe_{self.inst.MODEL}") as executor:
+            probes = list(executor.map(lambda port: self._probe_resource(port, self.inst.QUERY_CMD), candidates))
+        probes = [probe for probe in probes if probe is not None]
+        for probe in probes[1:]:
+            probe[1].close()
+        return probes[0] if len(probes) > 0 else None
 
     def _connect_visa_device(self) -> None:
-        port = self._find_device_vpid()
         self.com_port = None
-        if port is not None:
-            self.com_port = self.visa_resource_manager.open_resource(port)
-        if self.com_port is not None:
-            self.device_id = self.query(self.inst.QUERY_CMD).strip()
-            if self.inst.QUERY_E_RESP not in self.device_id:
+        probe = self._use_handle()
+        if probe is None:
+            probe = self._find_cached_device()
+        if probe is None:
+            probe = self._find_device_vpid()
+        if probe is not None:
+            # Promote the probe session to the live connection, no second open or identification.
+            (port, self.com_port, resp) = probe
+            if self.inst.QUERY_E_RESP not in resp:
+                resp = self.query(self.inst.QUERY_CMD).strip()
+            if self.inst.QUERY_E_RESP not in resp:
                 logger_opt.error(f"    FAILED - Wrong device identifier (E_RESP) is returned!")
                 raise bsl_type.DeviceConnectionFailed
-            self.device_id = re.search(self.inst.SN_REG, self.device_id).group(0)
+            self.device_id = re.search(self.inst.SN_REG, resp).group(0)
             logger_opt.success(f"    {self.inst.MODEL} with DEVICE_ID: <light-blue><italic>{self.device_id}</italic></light-blue> found and connected!")
+            if self.use_cache:
+                discovery_cache.store(self.inst, self.device_id, visa_resource=port)
         pass
 
-    def query(self, cmd:str):
-        logger_opt.trace(f"        {self.inst.MODEL} - com-VISA - Query to {self.inst.MODEL} with {cmd}")
-        resp = self.com_port.query(cmd)
-        logger_opt.trace(f"        {self.inst.MODEL} - com-VISA - Resp from {self.inst.MODEL} with {repr(resp)}")
-        return resp
+    def query(self, cmd:str, parse=None):
+        """
+        - Query `cmd`, retried according to `retry_policy`.
+
+        Parameters
+        ----------
+        cmd : `str`
+            SCPI query to be sent.
+        parse : `callable`
+            (default to None)
+            Conversion of the response, e.g. `float`, applied within each
+            attempt so garbled responses failing to parse are retried too.
+        """
+        return self.retry_policy.call(self._query_once, cmd, parse, description=lambda: f"{self.inst.MODEL} query {repr(cmd)}")
+
+    def _query_once(self, cmd:str, parse=None):
+        if bsl_log.trace_enabled:
+            logger_opt.trace(f"        {self.inst.MODEL} - com-VISA - Query to {self.inst.MODEL} with {cmd}")
+        with self.lock:
+            resp = self.com_port.query(cmd)
+        if bsl_log.trace_enabled:
+            logger_opt.trace(f"        {self.inst.MODEL} - com-VISA - Resp from {self.inst.MODEL} with {repr(resp)}")
+        return resp if parse is None else parse(resp)
     
+    def query_batch(self, cmds:list[str], *, joined:bool=True) -> list[str]:
+        """
+        - Query all `cmds` and return their responses in order.
+
+        - With `joined`, all queries are sent as one `;`-joined SCPI
+        compound message and cost a single round trip. Each header is
+        rooted with `:` so it is not parsed relative to the previous one.
+
+        Parameters
+        ----------
+        cmds : `list[str]`
+            SCPI queries to be sent.
+        joined : `bool`
+            (default to True)
+            Send a single compound query, otherwise query one by one
+            for devices without compound message support.
+
+        Returns
+        --------
+        resps : `list[str]`
+            Responses in the same order as `cmds`.
+
+        Raises
+        --------
+        Response count mismatch : `bsl_type.DeviceInconsistentError`
+            The compound response does not hold one field per query.
+        """
+        if not joined:
+            return [self.query(cmd).strip() for cmd in cmds]
+        return self.retry_policy.call(self._query_batch_once, cmds, description=lambda: f"{self.inst.MODEL} batched query")
+
+    def _query_batch_once(self, cmds:list[str]) -> list[str]:
+        msg = ";".join(cmd if cmd.startswith(("*", ":")) else ":" + cmd for cmd in cmds)
+        resps = self._query_once(msg).strip().split(";")
+        if len(resps) != len(cmds):
+            logger_opt.error(f"    FAILED - {self.inst.MODEL} returned {len(resps)} responses for {len(cmds)} batched queries!")
+            raise bsl_type.DeviceInconsistentError
+        return [resp.strip() for resp in resps]
+
     def write(self, cmd:str) -> None:
-        logger_opt.trace(f"        {self.inst.MODEL} - com-VISA - Write to {self.inst.MODEL} with {cmd}")
-        self.com_port.write(cmd)
+        self.retry_policy.call(self._write_once, cmd, description=lambda: f"{self.inst.MODEL} write {repr(cmd)}")
         pass
 
+    def _write_once(self, cmd:str) -> None:
+        if bsl_log.trace_enabled:
+            logger_opt.trace(f"        {self.inst.MODEL} - com-VISA - Write to {self.inst.MODEL} with {cmd}")
+        with self.lock:
+            self.com_port.write(cmd)
+        pass
+
+    async def _run_async(self, func, *args):
+        # VISA sessions are blocking, offload to the default executor and
+        # serialize calls per instrument so a session is never used concurrently.
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def query_async(self, cmd:str) -> str:
+        """
+        - Async counterpart of `query`.
+        """
+        return await self._run_async(self.query, cmd)
+
+    async def write_async(self, cmd:str) -> None:
+        """
+        - Async counterpart of `write`.
+        """
+        return await self._run_async(self.write, cmd)
+
+    async def readline_async(self) -> str:
+        """
+        - Async counterpart of reading one response from the session.
+        """
+        return await self._run_async(self._read_once)
+
+    def _read_once(self) -> str:
+        with self.lock:
+            return self.com_port.read()
+
     def set_timeout_ms(self, timeout:int) -> None:
         self.com_port.timeout = timeout
         pass
 
+    @contextlib.contextmanager
+    def timeout_at_least(self, timeout:float):
+        """
+        - Context raising the session timeout to at least `timeout` ms,
+        e.g. around long measurements, restored on exit.
+        """
+        previous = self.com_port.timeout
+        if previous is not None and previous < timeout:
+            self.com_port.timeout = timeout
+        try:
+            yield
+        finally:
+            self.com_port.timeout = previous
+
     def close(self) -> None:
         if self.com_port is not None:
             self.com_port.close()
         pass
 
 
-        
\ No newline at end of file
+async def connect_async(target_inst:bsl_inst_info_list, device_sn:str="", **kwargs) -> "bsl_visa":
+    """
+    - Async counterpart of `bsl_visa(target_inst, device_sn)`, discovery
+    runs in the default executor so the event loop is never blocked.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(bsl_visa, target_inst, device_sn, **kwargs))
@@ -0,0 +1,138 @@
+from loguru import logger
+from ._bsl_inst_info_class import bsl_inst_info_class
+
+import os
+import json
+import threading
+import time
+
+logger_opt = logger.opt(ansi=True)
+
+
+class bsl_inst_cache:
+    """
+    - Persistent on-disk discovery cache, mapping (`MODEL`, S/N) of an
+    instrument to the last working connection parameters:
+    serial port name, baudrate, USB serial string and VISA resource string.
+    Drivers may keep measured per-device settings next to them, see
+    `store_setting`.
+
+    - The cache file location defaults to `~/.bsl_inst/discovery_cache.json`
+    and can be overridden with the `BSL_INST_CACHE_PATH` environment variable.
+    """
+    DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".bsl_inst", "discovery_cache.json")
+
+    def __init__(self, path:str=None) -> None:
+        self.path = path if path is not None else os.environ.get("BSL_INST_CACHE_PATH", self.DEFAULT_PATH)
+        self._entries = None
+        self._lock = threading.Lock()
+        pass
+
+    @staticmethod
+    def _key(model:str, device_sn:str) -> str:
+        return f"{model}|{device_sn}"
+
+    def _load(self) -> dict:
+        # Lazily read the cache file once per process, a broken file is treated as empty.
+        if self._entries is None:
+            try:
+                with open(self.path, "r") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = dict()
+        return self._entries
+
+    def _save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w") as f:
+                json.dump(self._entries, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger_opt.warning(f"    Failed to write discovery cache <light-blue><italic>{self.path}</italic></light-blue>: {e}")
+        pass
+
+    def lookup(self, inst:bsl_inst_info_class, device_sn:str="") -> list[dict]:
+        """
+        - Return all cached entries of the given instrument model whose S/N
+        contains `device_sn`, most recently stored first.
+
+        Parameters
+        ----------
+        inst : `bsl_inst_info_class`
+            Instrument description from `bsl_inst_info_list`.
+        device_sn : `str`
+            (default to "")
+            Requested S/N, empty string matches any cached S/N.
+
+        Returns
+        --------
+        entries : `list[dict]`
+            Cached entries with keys `device_sn`, `port`, `baudrate`,
+            `usb_serial` and `visa_resource`.
+        """
+        with self._lock:
+            entries = [dict(entry) for entry in self._load().values() if entry["model"] == inst.MODEL and device_sn in entry["device_sn"]]
+        return sorted(entries, key=lambda entry: entry.get("timestamp", 0), reverse=True)
+
+    def store(self, inst:bsl_inst_info_class, device_sn:str, *, port:str=None, baudrate:int=None, usb_serial:str=None, visa_resource:str=None) -> None:
+        """
+        - Record the last working connection parameters of an instrument.
+        """
+        entry = {
+            "model": inst.MODEL,
+            "device_sn": device_sn,
+            "port": port,
+            "baudrate": baudrate,
+            "usb_serial": usb_serial,
+            "visa_resource": visa_resource,
+            "timestamp": time.time(),
+        }
+        with self._lock:
+            # Settings measured by the driver survive a refresh of the connection parameters.
+            previous = self._load().get(self._key(inst.MODEL, device_sn))
+            if previous is not None and "settings" in previous:
+                entry["settings"] = previous["settings"]
+            self._load()[self._key(inst.MODEL, device_sn)] = entry
+            self._save()
+        logger_opt.trace(f"    Discovery cache updated for <light-blue><italic>{inst.MODEL} ({device_sn})</italic></light-blue>.")
+        pass
+
+    def lookup_setting(self, inst:bsl_inst_info_class, device_sn:str, key:str):
+        """
+        - Return a setting stored with `store_setting` for the exact S/N,
+        None if there is none.
+        """
+        with self._lock:
+            entry = self._load().get(self._key(inst.MODEL, device_sn))
+            if entry is None:
+                return None
+            return entry.get("settings", dict()).get(key)
+
+    def store_setting(self, inst:bsl_inst_info_class, device_sn:str, key:str, value) -> None:
+        """
+        - Keep a JSON-serializable per-device setting, e.g. a measured
+        command gap, with the cached entry of the instrument. Ignored if
+        the instrument has no cached entry, and dropped with the entry.
+        """
+        with self._lock:
+            entry = self._load().get(self._key(inst.MODEL, device_sn))
+            if entry is None:
+                return None
+            entry.setdefault("settings", dict())[key] = value
+            self._save()
+        pass
+
+    def invalidate(self, inst:bsl_inst_info_class, device_sn:str) -> None:
+        """
+        - Drop the cached entry of an instrument, e.g. after failed verification.
+        """
+        with self._lock:
+            if self._load().pop(self._key(inst.MODEL, device_sn), None) is not None:
+                self._save()
+        pass
+
+
+# Process-wide shared discovery cache used by the interface classes.
+discovery_cache = bsl_inst_cache()
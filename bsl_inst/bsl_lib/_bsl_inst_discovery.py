@@ -0,0 +1,162 @@
+from loguru import logger
+from ._bsl_inst_info import bsl_inst_info_list
+from ._bsl_inst_info_class import bsl_inst_info_class
+from ._bsl_inst_handle import bsl_inst_handle
+from ._bsl_inst_cache import discovery_cache
+from .Interface._bsl_serial import _check_device_resp
+from .Interface._bsl_visa import get_resource_manager, list_resources, list_opened_resources, _usb_id, _visa_usb_id
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from serial.tools.list_ports import comports
+
+logger_opt = logger.opt(ansi=True)
+
+# Upper bound of ports/resources probed at the same time, and overall discovery deadline.
+DISCOVERY_MAX_WORKERS = 8
+DISCOVERY_DEADLINE_S = 20.0
+
+class bsl_inst_registry:
+    """
+    - Index of the known instruments in `bsl_inst_info_list` by USB VID/PID,
+    `SERIAL_NAME` and VISA resource pattern, so every port or resource on
+    the bus is matched against all instruments in a single lookup.
+    """
+    def __init__(self, insts:list[bsl_inst_info_class]=None) -> None:
+        if insts is None:
+            insts = [value for (name, value) in vars(bsl_inst_info_list).items() if isinstance(value, bsl_inst_info_class) and not name.startswith("TEST_")]
+        self.insts = insts
+        self.by_usb_id = dict()
+        self.by_serial_name = dict()
+        for inst in insts:
+            usb_id = _usb_id(inst.USB_VID, inst.USB_PID)
+            if usb_id is not None:
+                self.by_usb_id.setdefault(usb_id, list()).append(inst)
+            if inst.SERIAL_NAME not in ("N/A", "???"):
+                self.by_serial_name.setdefault(inst.SERIAL_NAME, list()).append(inst)
+        pass
+
+    def match_serial_port(self, port) -> list[bsl_inst_info_class]:
+        """
+        - Return the serial instruments which may sit behind the given
+        `ListPortInfo`, matched by USB VID/PID or by `SERIAL_NAME`.
+        """
+        candidates = list(self.by_usb_id.get((port.vid, port.pid), list()))
+        for (serial_name, insts) in self.by_serial_name.items():
+            if serial_name in port.description:
+                candidates.extend(insts)
+        return [inst for (index, inst) in enumerate(candidates) if inst.INTERFACE == "Serial" and inst not in candidates[:index]]
+
+    def match_visa_resource(self, resource:str) -> list[bsl_inst_info_class]:
+        """
+        - Return the VISA instruments which may sit behind the given
+        resource string, matched by USB VID/PID.
+        """
+        return [inst for inst in self.by_usb_id.get(_visa_usb_id(resource), list()) if inst.INTERFACE == "VISA"]
+
+
+def _probe_serial_port(port, candidates:list[bsl_inst_info_class], deadline:float) -> bsl_inst_handle:
+    for inst in candidates:
+        (temp_port, baudrate, device_id) = _check_device_resp(inst, port.device, "", None, deadline)
+        if temp_port is not None:
+            return bsl_inst_handle(inst=inst, device_id=device_id, port=temp_port, baudrate=baudrate, usb_serial=port.serial_number)
+    return None
+
+
+def _probe_visa_resource(resource_manager, resource:str, candidates:list[bsl_inst_info_class]) -> bsl_inst_handle:
+    for inst in candidates:
+        try:
+            temp_com_port = resource_manager.open_resource(resource)
+            try:
+                resp = temp_com_port.query(inst.QUERY_CMD).strip()
+            finally:
+                temp_com_port.close()
+        except Exception as e:
+            logger_opt.warning(f"    BUSY - Device <light-blue><italic>{resource}</italic></light-blue> failed to respond ({type(e)}), moving to next available device...")
+            return None
+        device_id = re.search(inst.SN_REG, resp)
+        if inst.QUERY_E_RESP in resp and device_id is not None:
+            return bsl_inst_handle(inst=inst, device_id=device_id.group(0), visa_resource=resource)
+    return None
+
+
+def discover_all(models:list[str]=None, *, use_cache:bool=True) -> dict[str, list[bsl_inst_handle]]:
+    """
+    - Walk the serial and VISA buses once and identify every known
+    instrument on them, including several units of the same model.
+
+    Parameters
+    ----------
+    models : `list[str]`
+        (default to None)
+        Restrict discovery to these `MODEL` names, all known models if None.
+    use_cache : `bool`
+        (default to True)
+        Record every identified instrument in the discovery cache.
+
+    Returns
+    --------
+    handles : `dict[str, list[bsl_inst_handle]]`
+        Identified instruments by `MODEL`, to be passed to driver
+        constructors with `handles=...`.
+    """
+    registry = bsl_inst_registry()
+    if models is not None:
+        registry = bsl_inst_registry([inst for inst in registry.insts if inst.MODEL in models])
+    deadline = time.monotonic() + DISCOVERY_DEADLINE_S
+    futures = list()
+
+    with ThreadPoolExecutor(max_workers=DISCOVERY_MAX_WORKERS, thread_name_prefix="bsl_discovery") as executor:
+        for port in comports():
+            candidates = registry.match_serial_port(port)
+            if len(candidates) > 0:
+                logger_opt.debug(f"    Port <light-blue><italic>{port.device}</italic></light-blue> may host {[inst.MODEL for inst in candidates]}.")
+                futures.append(executor.submit(_probe_serial_port, port, candidates, deadline))
+
+        if any(inst.INTERFACE == "VISA" for inst in registry.insts):
+            try:
+                resource_manager = get_resource_manager()
+                resource_list = list_resources(max_age=0.0)
+                opened_resources = list_opened_resources()
+            except Exception as e:
+                logger_opt.warning(f"    VISA bus not available ({type(e)}), skipped.")
+                resource_list = list()
+            for resource in resource_list:
+                if resource in opened_resources:
+                    continue
+                candidates = registry.match_visa_resource(resource)
+                if len(candidates) > 0:
+                    logger_opt.debug(f"    Resource <light-blue><italic>{resource}</italic></light-blue> may host {[inst.MODEL for inst in candidates]}.")
+                    futures.append(executor.submit(_probe_visa_resource, resource_manager, resource, candidates))
+
+        handles = dict()
+        for future in futures:
+            try:
+                handle = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except Exception as e:
+                logger_opt.warning(f"    Discovery probe failed with {type(e)}.")
+                continue
+            if handle is None:
+                continue
+            logger_opt.success(f"    {handle.inst.MODEL} with DEVICE_ID: <light-blue><italic>{handle.device_id}</italic></light-blue> discovered.")
+            handles.setdefault(handle.inst.MODEL, list()).append(handle)
+            if use_cache:
+                discovery_cache.store(handle.inst, handle.device_id, port=handle.port, baudrate=handle.baudrate, usb_serial=handle.usb_serial, visa_resource=handle.visa_resource)
+
+    for model_handles in handles.values():
+        model_handles.sort(key=lambda handle: handle.device_id)
+    return handles
+
+
+def select_handle(handles:dict[str, list[bsl_inst_handle]], inst:bsl_inst_info_class, device_sn:str="") -> bsl_inst_handle:
+    """
+    - Pick the first discovered handle of `inst` whose S/N contains `device_sn`,
+    None if `handles` is None or holds no such instrument.
+    """
+    if handles is None:
+        return None
+    for handle in handles.get(inst.MODEL, list()):
+        if device_sn in handle.device_id:
+            return handle
+    return None
@@ -0,0 +1,20 @@
+from ._bsl_inst_info_class import bsl_inst_info_class
+
+
+class bsl_inst_handle:
+    """
+    - Connection parameters of one identified instrument, as returned by
+    `discover_all`. Pass it to a driver constructor (`handle=...`) to
+    connect directly without scanning the bus again.
+    """
+    def __init__(self, *, inst:bsl_inst_info_class, device_id:str, port:str=None, baudrate:int=None, usb_serial:str=None, visa_resource:str=None):
+        self.inst                   =   inst
+        self.device_id              =   device_id
+        self.port                   =   port
+        self.baudrate               =   baudrate
+        self.usb_serial             =   usb_serial
+        self.visa_resource          =   visa_resource
+
+    def __repr__(self) -> str:
+        location = self.visa_resource if self.visa_resource is not None else f"{self.port}@{self.baudrate}"
+        return f"bsl_inst_handle({self.inst.MODEL}, {self.device_id}, {location})"
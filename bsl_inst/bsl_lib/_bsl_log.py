@@ -0,0 +1,12 @@
+from loguru import logger
+
+
+class bsl_log:
+    # Cached "is TRACE enabled" flag, checked on the transport hot path before
+    # any trace message is formatted. Kept in sync by `bsl_inst.init_logger`.
+    trace_enabled = False
+
+    @staticmethod
+    def update_level(LOG_LEVEL:str) -> None:
+        bsl_log.trace_enabled = logger.level(LOG_LEVEL).no <= logger.level("TRACE").no
+        pass
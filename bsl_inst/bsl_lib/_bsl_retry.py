@@ -0,0 +1,166 @@
+from loguru import logger
+from ._bsl_type import bsl_type
+
+import time
+import random
+import threading
+import serial
+try:
+    from pyvisa.errors import VisaIOError
+except ImportError:
+    VisaIOError = None
+
+logger_opt = logger.opt(ansi=True)
+
+# VISA status code of an I/O timeout, `pyvisa.constants.StatusCode.error_timeout`.
+_VI_ERROR_TMO = -1073807339
+
+
+class bsl_retry_policy:
+    """
+    - Retry policy shared by the interface command paths: bounded number
+    of attempts, exponential backoff with jitter between them, optional
+    overall deadline, and classification of retryable errors.
+
+    - Retry counters are kept per policy object and exposed by `metrics`.
+
+    Parameters
+    ----------
+    max_attempts : `int`
+        (default to 1)
+        Attempts per call including the first one, 1 disables retrying.
+    base_delay_s : `float`
+        (default to 0.002)
+        Backoff before the first retry, doubled on every further retry.
+    max_delay_s : `float`
+        (default to 0.1)
+        Upper bound of a single backoff.
+    jitter : `float`
+        (default to 0.5)
+        Fraction of each backoff randomized, so parallel callers do not retry in lockstep.
+    deadline_s : `float`
+        (default to None)
+        Overall time budget of a call including retries, unbounded if None.
+    retryable : `tuple[type]`
+        (default to `RETRYABLE_ERRORS`)
+        Exception types treated as transient, see `is_retryable`.
+    """
+    # Transient errors: timeouts, garbled responses failing to parse, and inconsistent batched responses.
+    RETRYABLE_ERRORS = (TimeoutError, serial.SerialTimeoutException, ValueError, bsl_type.DeviceInconsistentError)
+
+    def __init__(self, max_attempts:int=1, base_delay_s:float=0.002, max_delay_s:float=0.1, jitter:float=0.5, deadline_s:float=None, retryable:tuple=None) -> None:
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+        self.jitter = jitter
+        self.deadline_s = deadline_s
+        self.retryable = self.RETRYABLE_ERRORS if retryable is None else tuple(retryable)
+        self._lock = threading.Lock()
+        self.reset_metrics()
+        pass
+
+    def __repr__(self) -> str:
+        return f"bsl_retry_policy(max_attempts={self.max_attempts}, base_delay_s={self.base_delay_s}, max_delay_s={self.max_delay_s}, jitter={self.jitter}, deadline_s={self.deadline_s})"
+
+    def is_retryable(self, e:BaseException) -> bool:
+        """
+        - Return True if `e` is a transient error worth retrying,
+        VISA I/O errors are only retried on timeout.
+        """
+        if VisaIOError is not None and isinstance(e, VisaIOError):
+            return e.error_code == _VI_ERROR_TMO
+        return isinstance(e, self.retryable)
+
+    def backoff(self, retry:int) -> float:
+        """
+        - Backoff in seconds before the `retry`-th retry, starting at 1.
+        """
+        delay = min(self.max_delay_s, self.base_delay_s * 2 ** (retry - 1))
+        return delay * (1 - self.jitter * random.random())
+
+    def call(self, func, *args, description="", retry_if=None, on_retry=None, **kwargs):
+        """
+        - Call `func(*args, **kwargs)` and retry it according to the policy.
+
+        Parameters
+        ----------
+        func : `callable`
+            Operation to be attempted.
+        description : `str` or `callable`
+            (default to "")
+            Short description of the operation for log messages, or a
+            function returning it, only called once a retry is logged so
+            the hot path never formats it.
+        retry_if : `callable`
+            (default to None)
+            Predicate on the result, a True result is retried like a
+            retryable error, e.g. an empty response after a read timeout.
+        on_retry : `callable`
+            (default to None)
+            Called without arguments before every retry, e.g. to flush
+            a late response of the failed attempt.
+
+        Returns
+        --------
+        result :
+            Result of the first successful attempt, or of the last
+            attempt when `retry_if` still holds after the last attempt.
+
+        Raises
+        --------
+        Last error : `Exception`
+            Non-retryable errors immediately, retryable ones once
+            attempts or deadline are exhausted.
+        """
+        deadline = None if self.deadline_s is None else time.monotonic() + self.deadline_s
+        self._count("calls")
+        attempt = 1
+        while True:
+            try:
+                result = func(*args, **kwargs)
+                if retry_if is None or not retry_if(result):
+                    return result
+                reason = f"result {repr(result)}"
+                error = None
+            except Exception as e:
+                if not self.is_retryable(e):
+                    self._count("failures")
+                    raise
+                reason = f"{type(e)}"
+                error = e
+
+            delay = self.backoff(attempt)
+            if callable(description):
+                description = description()
+            if attempt >= self.max_attempts or (deadline is not None and time.monotonic() + delay > deadline):
+                self._count("exhausted")
+                logger_opt.warning(f"    {description} FAILED after {attempt} attempt(s) with {reason}.")
+                if error is not None:
+                    raise error
+                return result
+            self._count("retries")
+            logger_opt.debug(f"    {description} retry {attempt}/{self.max_attempts - 1} in {delay*1000:.1f}ms after {reason}.")
+            time.sleep(delay)
+            if on_retry is not None:
+                on_retry()
+            attempt += 1
+
+    def _count(self, key:str) -> None:
+        with self._lock:
+            self._metrics[key] += 1
+        pass
+
+    @property
+    def metrics(self) -> dict:
+        """Copy of the counters: `calls`, `retries`, `exhausted` and non-retryable `failures`."""
+        with self._lock:
+            return dict(self._metrics)
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            self._metrics = {"calls": 0, "retries": 0, "exhausted": 0, "failures": 0}
+        pass
+
+
+# Policy of the interfaces unless overridden by the instrument driver: a single attempt.
+DEFAULT_RETRY_POLICY = bsl_retry_policy()
@@ -0,0 +1,95 @@
+import threading
+import numpy as np
+from numpy.typing import NDArray
+
+
+class bsl_ring_buffer:
+    """
+    - Preallocated, fixed-size ring buffer of timestamped samples.
+
+    - Every sample is written twice, `capacity` rows apart, so the latest
+    `n <= capacity` samples are always one contiguous block and can be
+    returned as zero-copy NumPy views. Views refer to live storage and
+    are overwritten by later appends, use `.copy()` to keep them.
+
+    Parameters
+    ----------
+    capacity : `int`
+        Number of samples kept.
+    n_fields : `int`
+        (default to 1)
+        Number of values per sample.
+    """
+    def __init__(self, capacity:int, n_fields:int=1) -> None:
+        self.capacity = capacity
+        self.n_fields = n_fields
+        self._timestamps = np.zeros(2*capacity, dtype=np.float64)
+        self._values = np.full((2*capacity, n_fields), np.nan, dtype=np.float64)
+        self._count = 0
+        self._lock = threading.Lock()
+        pass
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def total_count(self) -> int:
+        """Number of samples appended since creation, including overwritten ones."""
+        return self._count
+
+    def append(self, timestamp:float, values) -> None:
+        """
+        - Append one sample with its (monotonic) timestamp.
+        """
+        with self._lock:
+            index = self._count % self.capacity
+            self._timestamps[index] = self._timestamps[index + self.capacity] = timestamp
+            self._values[index] = self._values[index + self.capacity] = values
+            self._count += 1
+        pass
+
+    def view(self, n:int=None) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        - Zero-copy views of the latest `n` samples, oldest first.
+
+        Parameters
+        ----------
+        n : `int`
+            (default to all available samples)
+            Number of samples, capped at `capacity`.
+
+        Returns
+        --------
+        (timestamps, values) : `tuple[numpy.ndarray, numpy.ndarray]`
+            Timestamps with shape (n,), values with shape (n, n_fields).
+        """
+        with self._lock:
+            available = min(self._count, self.capacity)
+            n = available if n is None else min(n, available)
+            end = self._count % self.capacity + (self.capacity if self._count >= self.capacity else 0)
+            return (self._timestamps[end-n:end], self._values[end-n:end])
+
+    def window(self, seconds:float) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        - Zero-copy views of the samples within the last `seconds`
+        seconds of the latest timestamp, oldest first.
+        """
+        (timestamps, values) = self.view()
+        if len(timestamps) == 0:
+            return (timestamps, values)
+        start = np.searchsorted(timestamps, timestamps[-1] - seconds, side="left")
+        return (timestamps[start:], values[start:])
+
+    def latest(self) -> tuple[float, NDArray[np.float64]]:
+        """
+        - Return the latest (timestamp, values), or (None, None) if empty.
+        """
+        (timestamps, values) = self.view(1)
+        if len(timestamps) == 0:
+            return (None, None)
+        return (float(timestamps[0]), values[0].copy())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._count = 0
+        pass
@@ -0,0 +1,167 @@
+import math
+import threading
+import typing
+
+
+class _p2_quantile:
+    """
+    - Constant-memory estimate of one quantile with the P-square algorithm
+    (Jain & Chlamtac, 1985), five markers updated per sample.
+    """
+    def __init__(self, p:float) -> None:
+        self.p = p
+        self._heights = list()
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 1 + 2*p, 1 + 4*p, 3 + 2*p, 5]
+        self._increments = [0, p/2, p, (1 + p)/2, 1]
+        pass
+
+    def update(self, x:float) -> None:
+        heights = self._heights
+        if len(heights) < 5:
+            heights.append(x)
+            heights.sort()
+            return None
+
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if heights[i] <= x < heights[i+1])
+        for i in range(k+1, 5):
+            self._positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in (1, 2, 3):
+            d = self._desired[i] - self._positions[i]
+            if (d >= 1 and self._positions[i+1] - self._positions[i] > 1) or (d <= -1 and self._positions[i-1] - self._positions[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not heights[i-1] < height < heights[i+1]:
+                    height = heights[i] + d * (heights[i+d] - heights[i]) / (self._positions[i+d] - self._positions[i])
+                heights[i] = height
+                self._positions[i] += d
+        pass
+
+    def _parabolic(self, i:int, d:int) -> float:
+        (q, n) = (self._heights, self._positions)
+        return q[i] + d / (n[i+1] - n[i-1]) * (
+            (n[i] - n[i-1] + d) * (q[i+1] - q[i]) / (n[i+1] - n[i])
+            + (n[i+1] - n[i] - d) * (q[i] - q[i-1]) / (n[i] - n[i-1]))
+
+    def value(self) -> float:
+        heights = self._heights
+        if len(heights) == 0:
+            return math.nan
+        if len(heights) < 5:
+            return heights[min(len(heights) - 1, int(round(self.p * (len(heights) - 1))))]
+        return heights[2]
+
+
+class bsl_stats:
+    """
+    - Constant-memory streaming statistics of a sample stream: count,
+    Welford mean and variance, min/max, an exponentially weighted moving
+    average and approximate percentiles (P-square sketch).
+
+    - Thread safe, samples can be fed from an acquisition thread while
+    `snapshot` is called from another one.
+
+    Parameters
+    ----------
+    ewma_alpha : `float`
+        (default to 0.01)
+        Weight of the newest sample in the moving average.
+    percentiles : `tuple[float]`
+        (default to (0.05, 0.5, 0.95))
+        Percentiles to be tracked, as fractions.
+    """
+    class SNAPSHOT(typing.NamedTuple):
+        """Immutable record of the accumulated statistics."""
+        count: int
+        mean: float
+        variance: float
+        std: float
+        min: float
+        max: float
+        ewma: float
+        percentiles: dict
+
+    def __init__(self, ewma_alpha:float=0.01, percentiles:tuple[float]=(0.05, 0.5, 0.95)) -> None:
+        self.ewma_alpha = ewma_alpha
+        self.percentiles = tuple(percentiles)
+        self._lock = threading.Lock()
+        self.reset()
+        pass
+
+    def reset(self) -> None:
+        """
+        - Drop all accumulated samples.
+        """
+        with self._lock:
+            self._count = 0
+            self._mean = 0.0
+            self._m2 = 0.0
+            self._min = math.inf
+            self._max = -math.inf
+            self._ewma = math.nan
+            self._quantiles = [_p2_quantile(p) for p in self.percentiles]
+        pass
+
+    def update(self, x:float) -> None:
+        """
+        - Accumulate one sample, NaN samples are ignored.
+        """
+        x = float(x)
+        if math.isnan(x):
+            return None
+        with self._lock:
+            self._count += 1
+            delta = x - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (x - self._mean)
+            self._min = min(self._min, x)
+            self._max = max(self._max, x)
+            self._ewma = x if self._count == 1 else self._ewma + self.ewma_alpha * (x - self._ewma)
+            for quantile in self._quantiles:
+                quantile.update(x)
+        pass
+
+    def update_many(self, xs) -> None:
+        """
+        - Accumulate an iterable of samples in order, e.g. a NumPy array.
+        """
+        for x in xs:
+            self.update(x)
+        pass
+
+    def __len__(self) -> int:
+        return self._count
+
+    def snapshot(self) -> SNAPSHOT:
+        """
+        - Export the current statistics, NaN where undefined.
+
+        Returns
+        --------
+        snapshot : `bsl_stats.SNAPSHOT`
+            Count, mean, sample variance and std, min, max, EWMA and
+            the percentiles keyed by their fraction.
+        """
+        with self._lock:
+            count = self._count
+            variance = self._m2 / (count - 1) if count > 1 else math.nan
+            return self.SNAPSHOT(
+                count=count,
+                mean=self._mean if count > 0 else math.nan,
+                variance=variance,
+                std=math.sqrt(variance),
+                min=self._min if count > 0 else math.nan,
+                max=self._max if count > 0 else math.nan,
+                ewma=self._ewma,
+                percentiles={quantile.p: quantile.value() for quantile in self._quantiles},
+            )